@@ -35,7 +35,6 @@ class SackdCharm(CharmBase):
         self._stored.set_default(
             auth_key=str(),
             sackd_installed=False,
-            slurmctld_available=False,
             slurmctld_host=str(),
         )
 
@@ -77,41 +76,50 @@ class SackdCharm(CharmBase):
             event.defer()
             return
 
-        if (slurmctld_host := event.slurmctld_host) != self._stored.slurmctld_host:
-            if slurmctld_host is not None:
-                self._sackd.config_server = f"{slurmctld_host}:6817"
-                self._stored.slurmctld_host = slurmctld_host
-                logger.debug(f"slurmctld_host={slurmctld_host}")
-            else:
-                logger.debug("'slurmctld_host' not in event data.")
-                return
-
-        if (auth_key := event.auth_key) != self._stored.auth_key:
-            if auth_key is not None:
-                self._stored.auth_key = auth_key
-                self._sackd.munge.key.set(auth_key)  # TODO change this once auth/slurm in place
-            else:
-                logger.debug("'auth_key' not in event data.")
-                return
-
-        logger.debug("#### Storing slurmctld_available event relation data in charm StoredState.")
-        self._stored.slurmctld_available = True
-
-        # Restart sackd after we write event data to respective locations.
-        self._sackd.munge.service.restart()  # TODO change this once auth/slurm in place
-        self._sackd.service.enable()
-        if self._check_status():
-            self.unit.status = ActiveStatus()
+        if (slurmctld_host := event.slurmctld_host) is None:
+            logger.debug("'slurmctld_host' not in event data.")
+            return
+
+        if (auth_key := event.auth_key) is None:
+            logger.debug("'auth_key' not in event data.")
+            return
+
+        # Only touch StoredState and the sackd/munge configuration when the
+        # event data differs from what is already stored.
+        changed = False
+        if slurmctld_host != self._stored.slurmctld_host:
+            self._sackd.config_server = f"{slurmctld_host}:6817"
+            self._stored.slurmctld_host = slurmctld_host
+            logger.debug(f"slurmctld_host={slurmctld_host}")
+            changed = True
+
+        if auth_key != self._stored.auth_key:
+            self._stored.auth_key = auth_key
+            self._sackd.munge.key.set(auth_key)  # TODO change this once auth/slurm in place
+            changed = True
+
+        if changed:
+            # Restart sackd after we write event data to respective locations.
+            self._sackd.munge.service.restart()  # TODO change this once auth/slurm in place
+            self._sackd.service.enable()
+        else:
+            logger.debug("slurmctld_available event data unchanged. skipping restart.")
+
+        self._check_status()
 
     def _on_slurmctld_unavailable(self, _) -> None:
-        """Stop sackd and set slurmctld_available = False when we lose slurmctld."""
+        """Stop sackd and clear the slurmctld data when we lose slurmctld."""
         logger.debug("## Slurmctld unavailable")
-        self._stored.slurmctld_available = False
         self._stored.auth_key = ""
         self._stored.slurmctld_host = ""
         self._sackd.service.disable()
         self._check_status()
 
+    @property
+    def _slurmctld_available(self) -> bool:
+        """Return True if the slurmctld host and auth key have been configured."""
+        return bool(self._stored.slurmctld_host and self._stored.auth_key)
+
     def _check_status(self) -> bool:
         """Check if we have all needed components.
 
@@ -129,10 +137,11 @@ class SackdCharm(CharmBase):
             self.unit.status = BlockedStatus("Need relations: slurmctld")
             return False
 
-        if self._stored.slurmctld_available is not True:
+        if not self._slurmctld_available:
             self.unit.status = WaitingStatus("Waiting on: slurmctld")
             return False
 
+        self.unit.status = ActiveStatus()
         return True
 
 
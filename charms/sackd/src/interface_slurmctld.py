@@ -2,7 +2,7 @@
 
 import json
 import logging
-from typing import Union
+from typing import Optional, Union
 
 from ops import (
     EventBase,
@@ -14,12 +14,19 @@ from ops import (
     RelationChangedEvent,
 )
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
 logger = logging.getLogger(__name__)
 
 
 class SlurmctldAvailableEvent(EventBase):
     """Emitted when slurmctld is available."""
 
+    __slots__ = ("auth_key", "slurmctld_host")
+
     def __init__(
         self,
         handle,
@@ -47,6 +54,8 @@ class SlurmctldAvailableEvent(EventBase):
 class SlurmctldUnavailableEvent(EventBase):
     """Emit when the relation to slurmctld is broken."""
 
+    __slots__ = ()
+
 
 class Events(ObjectEvents):
     """Sackd emitted events."""
@@ -65,6 +74,9 @@ class Slurmctld(Object):
         super().__init__(charm, relation_name)
         self._charm = charm
         self._relation_name = relation_name
+        # Last raw `cluster_info` seen on the relation and its decoded form.
+        self._last_raw: Optional[str] = None
+        self._last_parsed: Optional[dict] = None
 
         self.framework.observe(
             self._charm.on[self._relation_name].relation_changed,
@@ -91,11 +103,17 @@ class Slurmctld(Object):
         if app := event.app:
             if app_data := event.relation.data.get(app):
                 if cluster_info_json := app_data.get("cluster_info"):
-                    try:
-                        cluster_info = json.loads(cluster_info_json)
-                    except json.JSONDecodeError as e:
-                        logger.error(e)
-                        raise (e)
+                    if cluster_info_json == self._last_raw and self._last_parsed is not None:
+                        cluster_info = self._last_parsed
+                    else:
+                        try:
+                            cluster_info = _loads(cluster_info_json)
+                        except json.JSONDecodeError as e:
+                            logger.error(e)
+                            raise (e)
+
+                        self._last_raw = cluster_info_json
+                        self._last_parsed = cluster_info
 
                     logger.debug(f"cluster_info: {cluster_info}")
                     self.on.slurmctld_available.emit(**cluster_info)
@@ -111,6 +129,8 @@ class Slurmctld(Object):
 
     def _on_relation_broken(self, event: RelationBrokenEvent) -> None:
         """Emit slurmctld_unavailable when the relation-broken event occurs."""
+        self._last_raw = None
+        self._last_parsed = None
         self.on.slurmctld_unavailable.emit()
 
     @property
@@ -121,4 +141,4 @@ class Slurmctld(Object):
     @property
     def is_joined(self) -> bool:
         """Return True if relation is joined."""
-        return True if self.model.relations.get(self._relation_name) else False
+        return bool(self.model.relations.get(self._relation_name))
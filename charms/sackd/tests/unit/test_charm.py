@@ -20,7 +20,7 @@ from unittest.mock import Mock, PropertyMock, patch
 
 from charm import SackdCharm
 from ops.model import ActiveStatus, BlockedStatus
-from scenario import Context, State
+from scenario import Context, Relation, State, StoredState
 
 from charms.hpc_libs.v0.slurm_ops import SlurmOpsError
 
@@ -66,7 +66,8 @@ class TestCharm(TestCase):
         """Test `UpdateStateEvent` hook success."""
         with self.ctx(self.ctx.on.update_status(), State()) as manager:
             manager.charm._stored.sackd_installed = True
-            manager.charm._stored.slurmctld_available = True
+            manager.charm._stored.auth_key = "=ABC="
+            manager.charm._stored.slurmctld_host = "slurmctld-0"
             manager.charm.unit.status = ActiveStatus()
             manager.run()
             # ActiveStatus is the expected value when _check_status does not
@@ -74,6 +75,33 @@ class TestCharm(TestCase):
             self.assertTrue(manager.charm._check_status())
             self.assertEqual(manager.charm.unit.status, ActiveStatus())
 
+    def test_slurmctld_available_unchanged(self) -> None:
+        """Test that an unchanged `slurmctld_available` event does not restart services."""
+        relation = Relation(
+            endpoint="slurmctld",
+            remote_app_name="slurmctld",
+            remote_app_data={
+                "cluster_info": '{"auth_key": "=ABC=", "slurmctld_host": "slurmctld-0"}'
+            },
+        )
+        stored_state = StoredState(
+            owner_path="SackdCharm",
+            content={
+                "auth_key": "=ABC=",
+                "sackd_installed": True,
+                "slurmctld_host": "slurmctld-0",
+            },
+        )
+        state = State(relations={relation}, stored_states={stored_state})
+        with self.ctx(self.ctx.on.relation_changed(relation), state) as manager:
+            manager.charm._sackd.munge = Mock()
+            manager.charm._sackd.service = Mock()
+            manager.run()
+
+            manager.charm._sackd.munge.service.restart.assert_not_called()
+            manager.charm._sackd.service.enable.assert_not_called()
+            self.assertEqual(manager.charm.unit.status, ActiveStatus())
+
     def test_update_status_install_fail(self) -> None:
         """Test `UpdateStateEvent` hook failure."""
         with self.ctx(self.ctx.on.update_status(), State()) as manager:
@@ -4,8 +4,8 @@
 
 """SlurmctldCharm."""
 
+import functools
 import logging
-import shlex
 import subprocess
 from typing import Any, Dict, List, Optional, Union
 
@@ -46,6 +46,16 @@ from charms.hpc_libs.v0.slurm_ops import SlurmctldManager, SlurmOpsError
 logger = logging.getLogger()
 
 
+@functools.lru_cache(maxsize=4)
+def _parse_kv_block(raw: str) -> Dict[str, str]:
+    """Parse a block of `KEY=VALUE` lines, ignoring comments and blank lines."""
+    return dict(
+        line.split("=", 1)
+        for line in raw.split("\n")
+        if not line.startswith("#") and line.strip() != ""
+    )
+
+
 class SlurmctldCharm(CharmBase):
     """Slurmctld lifecycle events."""
 
@@ -67,6 +77,11 @@ class SlurmctldCharm(CharmBase):
         )
 
         self._slurmctld = SlurmctldManager(snap=False)
+        self._cached_slurm_conf: Optional[SlurmConfig] = None
+
+        # Interfaces must be constructed on every hook so that their observers are
+        # registered before ops dispatches the event. None of them touch the filesystem
+        # on construction; COSAgentProvider only reads its rules and dashboards on refresh.
         self._sackd = Sackd(self, "login-node")
         self._slurmd = Slurmd(self, "slurmd")
         self._slurmdbd = Slurmdbd(self, "slurmdbd")
@@ -79,22 +94,22 @@ class SlurmctldCharm(CharmBase):
             recurse_rules_dirs=True,
         )
 
-        event_handler_bindings = {
-            self.on.install: self._on_install,
-            self.on.update_status: self._on_update_status,
-            self.on.config_changed: self._on_config_changed,
-            self._slurmdbd.on.slurmdbd_available: self._on_slurmdbd_available,
-            self._slurmdbd.on.slurmdbd_unavailable: self._on_slurmdbd_unavailable,
-            self._slurmd.on.partition_available: self._on_write_slurm_conf,
-            self._slurmd.on.partition_unavailable: self._on_write_slurm_conf,
-            self._slurmd.on.slurmd_available: self._on_slurmd_available,
-            self._slurmd.on.slurmd_departed: self._on_slurmd_departed,
-            self._slurmrestd.on.slurmrestd_available: self._on_slurmrestd_available,
-            self.on.show_current_config_action: self._on_show_current_config_action,
-            self.on.drain_action: self._on_drain_nodes_action,
-            self.on.resume_action: self._on_resume_nodes_action,
-        }
-        for event, handler in event_handler_bindings.items():
+        event_handler_bindings = (
+            (self.on.install, self._on_install),
+            (self.on.update_status, self._on_update_status),
+            (self.on.config_changed, self._on_config_changed),
+            (self._slurmdbd.on.slurmdbd_available, self._on_slurmdbd_available),
+            (self._slurmdbd.on.slurmdbd_unavailable, self._on_slurmdbd_unavailable),
+            (self._slurmd.on.partition_available, self._on_write_slurm_conf),
+            (self._slurmd.on.partition_unavailable, self._on_write_slurm_conf),
+            (self._slurmd.on.slurmd_available, self._on_slurmd_available),
+            (self._slurmd.on.slurmd_departed, self._on_slurmd_departed),
+            (self._slurmrestd.on.slurmrestd_available, self._on_slurmrestd_available),
+            (self.on.show_current_config_action, self._on_show_current_config_action),
+            (self.on.drain_action, self._on_drain_nodes_action),
+            (self.on.resume_action, self._on_resume_nodes_action),
+        )
+        for event, handler in event_handler_bindings:
             self.framework.observe(event, handler)
 
     def _on_install(self, event: InstallEvent) -> None:
@@ -130,6 +145,10 @@ class SlurmctldCharm(CharmBase):
 
     def _on_config_changed(self, event: ConfigChangedEvent) -> None:
         """Perform config-changed operations."""
+        # Each option is compared against its StoredState copy so that config-changed,
+        # which fires on many hooks that don't touch the charm config, is a no-op when
+        # nothing changed. `cgroup-parameters` is deliberately not compared: it is read
+        # when slurm.conf is written, so a change to it alone does not rewrite cgroup.conf.
         charm_config_nhc_params = str(self.config.get("health-check-params", ""))
         if (charm_config_nhc_params != self._stored.nhc_params) and (
             charm_config_nhc_params != ""
@@ -164,14 +183,14 @@ class SlurmctldCharm(CharmBase):
 
     def _on_show_current_config_action(self, event: ActionEvent) -> None:
         """Show current slurm.conf."""
-        event.set_results({"slurm.conf": str(self._slurmctld.config.load())})
+        event.set_results({"slurm.conf": str(self._current_slurm_conf())})
 
     def _on_slurmrestd_available(self, event: SlurmrestdAvailableEvent) -> None:
         """Check that we have slurm_config when slurmrestd available otherwise defer the event."""
         if self.model.unit.is_leader():
             if self._check_status():
                 self._slurmrestd.set_slurm_config_on_app_relation_data(
-                    str(self._slurmctld.config.load())
+                    str(self._current_slurm_conf())
                 )
                 return
             logger.debug("Cluster not ready yet, deferring event.")
@@ -190,12 +209,13 @@ class SlurmctldCharm(CharmBase):
         nodes = event.params["nodename"]
         reason = event.params["reason"]
 
-        logger.debug(f"#### Draining {nodes} because {reason}.")
+        logger.debug("#### Draining %s because %s.", nodes, reason)
         event.log(f"Draining {nodes} because {reason}.")
 
         try:
-            cmd = f'scontrol update nodename={nodes} state=drain reason="{reason}"'
-            subprocess.check_output(shlex.split(cmd))
+            subprocess.check_output(
+                ["scontrol", "update", f"nodename={nodes}", "state=drain", f"reason={reason}"]
+            )
             event.set_results({"status": "draining", "nodes": nodes})
         except subprocess.CalledProcessError as e:
             event.fail(message=f"Error draining {nodes}: {e.output}")
@@ -204,12 +224,11 @@ class SlurmctldCharm(CharmBase):
         """Resume specified nodes."""
         nodes = event.params["nodename"]
 
-        logger.debug(f"#### Resuming {nodes}.")
+        logger.debug("#### Resuming %s.", nodes)
         event.log(f"Resuming {nodes}.")
 
         try:
-            cmd = f"scontrol update nodename={nodes} state=idle"
-            subprocess.check_output(shlex.split(cmd))
+            subprocess.check_output(["scontrol", "update", f"nodename={nodes}", "state=idle"])
             event.set_results({"status": "resuming", "nodes": nodes})
         except subprocess.CalledProcessError as e:
             event.fail(message=f"Error resuming {nodes}: {e.output}")
@@ -296,16 +315,17 @@ class SlurmctldCharm(CharmBase):
         if slurm_config := self._assemble_slurm_conf():
             self._slurmctld.service.disable()
             self._slurmctld.config.dump(slurm_config)
+            self._cached_slurm_conf = slurm_config
 
             # Write out any cgroup parameters to /etc/slurm/cgroup.conf.
-            if not is_container():
-                cgroup_config = CHARM_MAINTAINED_CGROUP_CONF_PARAMETERS
-                if user_supplied_cgroup_params := self._get_user_supplied_cgroup_parameters():
-                    cgroup_config.update(user_supplied_cgroup_params)
+            if not self._is_container:
+                cgroup_config = {
+                    **CHARM_MAINTAINED_CGROUP_CONF_PARAMETERS,
+                    **self._get_user_supplied_cgroup_parameters(),
+                }
                 self._slurmctld.cgroup.dump(CgroupConfig(**cgroup_config))
 
             self._slurmctld.service.enable()
-            self._slurmctld.scontrol("reconfigure")
 
             # Transitioning Nodes
             #
@@ -314,24 +334,28 @@ class SlurmctldCharm(CharmBase):
             #
             # 2) If there are transitioning_nodes, resume them, and update the new_nodes in
             #    StoredState.
-            new_nodes_from_stored_state = self.new_nodes
             new_nodes_from_slurm_config = self._get_new_node_names_from_slurm_config(slurm_config)
 
+            # The stored new_nodes are only iterated here, so read them directly from
+            # StoredState rather than through the copying `new_nodes` property.
+            new_node_names_from_slurm_config = set(new_nodes_from_slurm_config)
             transitioning_nodes: list = [
                 node
-                for node in new_nodes_from_stored_state
-                if node not in new_nodes_from_slurm_config
+                for node in self._stored.new_nodes
+                if node not in new_node_names_from_slurm_config
             ]
 
             if len(transitioning_nodes) > 0:
-                self._resume_nodes(transitioning_nodes)
-                self.new_nodes = new_nodes_from_slurm_config.copy()
+                self._resume_nodes(transitioning_nodes, reconfigure=True)
+                self.new_nodes = new_nodes_from_slurm_config
+            else:
+                self._slurmctld.scontrol("reconfigure")
 
             # slurmrestd needs the slurm.conf file, so send it every time it changes.
             if self._slurmrestd.is_joined is not False:
                 self._slurmrestd.set_slurm_config_on_app_relation_data(str(slurm_config))
         else:
-            logger.debug("## Should write slurm.conf, but we don't have it. " "Deferring.")
+            logger.debug("## Should write slurm.conf, but we don't have it. Deferring.")
             event.defer()
 
     def _assemble_slurm_conf(self) -> SlurmConfig:
@@ -342,17 +366,15 @@ class SlurmctldCharm(CharmBase):
 
         def _assemble_slurmctld_parameters() -> dict[str, Any]:
             # Preprocess merging slurmctld_parameters if they exist in the context
-            slurmctld_parameters = {"enable_configless": True}
+            slurmctld_parameters: dict[str, Any] = {"enable_configless": True}
 
-            if (
-                user_supplied_slurmctld_parameters := user_supplied_parameters.get(
-                    "SlurmctldParameters", ""
-                )
-                != ""
+            if user_supplied_slurmctld_parameters := user_supplied_parameters.get(
+                "SlurmctldParameters", ""
             ):
                 for opt in user_supplied_slurmctld_parameters.split(","):
-                    k, v = opt.split("=", maxsplit=1)
-                    slurmctld_parameters.update({k: v})
+                    # Flag-only options, such as `enable_configless`, carry no value.
+                    key, sep, value = opt.partition("=")
+                    slurmctld_parameters[key] = value if sep else True
 
             return slurmctld_parameters
 
@@ -365,55 +387,61 @@ class SlurmctldCharm(CharmBase):
                 "AccountingStoragePort": "6819",
             }
 
-        slurm_conf = SlurmConfig(
+        # Merge all parameters into a single dict before constructing the configuration.
+        # User supplied parameters override the charm defaults, but the controller
+        # identity and the assembled SlurmctldParameters always take precedence.
+        slurm_conf_parameters = {
+            "ProctrackType": "proctrack/linuxproc" if self._is_container else "proctrack/cgroup",
+            "TaskPlugin": (
+                ["task/affinity"] if self._is_container else ["task/cgroup", "task/affinity"]
+            ),
+            **CHARM_MAINTAINED_SLURM_CONF_PARAMETERS,
+            **slurmd_parameters,
+            **accounting_params,
+            **user_supplied_parameters,
+        }
+        slurm_conf_parameters.update(
             ClusterName=self._cluster_name,
             SlurmctldAddr=self._ingress_address,
             SlurmctldHost=[self._slurmctld.hostname],
             SlurmctldParameters=_assemble_slurmctld_parameters(),
-            ProctrackType="proctrack/linuxproc" if is_container() else "proctrack/cgroup",
-            TaskPlugin=["task/affinity"] if is_container() else ["task/cgroup", "task/affinity"],
-            **accounting_params,
-            **CHARM_MAINTAINED_SLURM_CONF_PARAMETERS,
-            **slurmd_parameters,
-            **user_supplied_parameters,
         )
+        slurm_conf = SlurmConfig(**slurm_conf_parameters)
 
-        logger.debug(f"slurm.conf: {slurm_conf.dict()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("slurm.conf: %s", slurm_conf.dict())
         return slurm_conf
 
+    def _current_slurm_conf(self) -> SlurmConfig:
+        """Return the current slurm.conf, only loading it from disk if not already known."""
+        if self._cached_slurm_conf is None:
+            self._cached_slurm_conf = self._slurmctld.config.load()
+        return self._cached_slurm_conf
+
     def _get_user_supplied_parameters(self) -> Dict[Any, Any]:
         """Gather, parse, and return the user supplied parameters."""
         user_supplied_parameters = {}
         if custom_config := self.config.get("slurm-conf-parameters"):
-            user_supplied_parameters = {
-                line.split("=")[0]: line.split("=", 1)[1]
-                for line in str(custom_config).split("\n")
-                if not line.startswith("#") and line.strip() != ""
-            }
+            # Copy the cached result so that callers cannot mutate it.
+            user_supplied_parameters = dict(_parse_kv_block(str(custom_config)))
         return user_supplied_parameters
 
     def _get_user_supplied_cgroup_parameters(self) -> Dict[Any, Any]:
         """Gather, parse, and return the user supplied cgroup parameters."""
         user_supplied_cgroup_parameters = {}
         if custom_cgroup_config := self.config.get("cgroup-parameters"):
-            user_supplied_cgroup_parameters = {
-                line.split("=")[0]: line.split("=", 1)[1]
-                for line in str(custom_cgroup_config).split("\n")
-                if not line.startswith("#") and line.strip() != ""
-            }
+            # Copy the cached result so that callers cannot mutate it.
+            user_supplied_cgroup_parameters = dict(_parse_kv_block(str(custom_cgroup_config)))
         return user_supplied_cgroup_parameters
 
-    def _get_new_node_names_from_slurm_config(
-        self, slurm_config: SlurmConfig
-    ) -> List[Optional[str]]:
+    def _get_new_node_names_from_slurm_config(self, slurm_config: SlurmConfig) -> List[str]:
         """Given the slurm_config, return the nodes that are DownNodes with reason 'New node.'."""
-        new_node_names = []
-        if down_nodes_from_slurm_config := slurm_config.down_nodes:
-            for down_nodes_entry in down_nodes_from_slurm_config:
-                for down_node_name in down_nodes_entry["DownNodes"]:
-                    if down_nodes_entry["Reason"] == "New node.":
-                        new_node_names.append(down_node_name)
-        return new_node_names
+        return [
+            down_node_name
+            for down_nodes_entry in slurm_config.down_nodes or ()
+            if down_nodes_entry["Reason"] == "New node."
+            for down_node_name in down_nodes_entry["DownNodes"]
+        ]
 
     def _check_status(self) -> bool:  # noqa C901
         """Check for all relations and set appropriate status.
@@ -445,9 +473,25 @@ class SlurmctldCharm(CharmBase):
         """Get the stored jwt_rsa key."""
         return str(self._stored.jwt_rsa)
 
-    def _resume_nodes(self, nodelist: List[str]) -> None:
-        """Run scontrol to resume the specified node list."""
-        self._slurmctld.scontrol("update", f"nodename={','.join(nodelist)}", "state=resume")
+    @functools.cached_property
+    def _is_container(self) -> bool:
+        """Return True if slurmctld is running within a container.
+
+        The result is cached for the lifetime of the hook as it cannot change between calls.
+        """
+        return is_container()
+
+    def _resume_nodes(self, nodelist: List[str], reconfigure: bool = False) -> None:
+        """Run scontrol to resume the specified node list.
+
+        If `reconfigure` is True, slurmctld is reconfigured before the nodes are
+        resumed within the same `scontrol` invocation.
+        """
+        resume = ("update", f"nodename={','.join(nodelist)}", "state=resume")
+        if reconfigure:
+            self._slurmctld.scontrol(stdin=f"reconfigure\n{' '.join(resume)}\n")
+        else:
+            self._slurmctld.scontrol(*resume)
 
     @property
     def _cluster_name(self) -> str:
@@ -468,7 +512,9 @@ class SlurmctldCharm(CharmBase):
     @new_nodes.setter
     def new_nodes(self, new_nodes: List[Any]) -> None:
         """Set the new nodes."""
-        self._stored.new_nodes = new_nodes
+        # Avoid marking StoredState dirty if the new nodes have not changed.
+        if self._stored.new_nodes != new_nodes:
+            self._stored.new_nodes = new_nodes
 
     @property
     def hostname(self) -> str:
@@ -480,7 +526,7 @@ class SlurmctldCharm(CharmBase):
         """Return the ingress_address from the peer relation if it exists."""
         if (peer_binding := self.model.get_binding(PEER_RELATION)) is not None:
             ingress_address = f"{peer_binding.network.ingress_address}"
-            logger.debug(f"Slurmctld ingress_address: {ingress_address}")
+            logger.debug("Slurmctld ingress_address: %s", ingress_address)
             return ingress_address
         raise IngressAddressUnavailableError("Ingress address unavailable")
 
@@ -2,6 +2,7 @@
 
 import json
 import logging
+from typing import Optional
 
 from ops import Object, RelationBrokenEvent, RelationCreatedEvent
 
@@ -16,6 +17,7 @@ class Sackd(Object):
         super().__init__(charm, relation_name)
         self._charm = charm
         self._relation_name = relation_name
+        self._cluster_info: Optional[str] = None
 
         self.framework.observe(
             self._charm.on[self._relation_name].relation_created,
@@ -34,12 +36,16 @@ class Sackd(Object):
             event.defer()
             return
 
-        event.relation.data[self.model.app]["cluster_info"] = json.dumps(
-            {
-                "auth_key": self._charm.get_munge_key(),  # TODO: change this once munge is auth/slurm
-                "slurmctld_host": self._charm.hostname,
-            }
-        )
+        # The cluster info is identical for every sackd relation, so only serialize it once.
+        if self._cluster_info is None:
+            self._cluster_info = json.dumps(
+                {
+                    "auth_key": self._charm.get_munge_key(),  # TODO: change this once munge is auth/slurm
+                    "slurmctld_host": self._charm.hostname,
+                }
+            )
+
+        event.relation.data[self.model.app]["cluster_info"] = self._cluster_info
 
     def _on_relation_broken(self, event: RelationBrokenEvent) -> None:
         """Clear the cluster info if the relation is broken."""
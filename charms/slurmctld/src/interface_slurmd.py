@@ -140,7 +140,8 @@ class Slurmd(Object):
                 if node.get("new_node"):
                     if node_config := node.get("node_parameters"):
                         if node_name := node_config.get("NodeName"):
-                            self._charm.new_nodes = list(set(self._charm.new_nodes + [node_name]))
+                            if node_name not in (new_nodes := self._charm.new_nodes):
+                                self._charm.new_nodes = new_nodes + [node_name]
                             self.on.slurmd_available.emit(
                                 node_name=node_name, gres_info=node.get("gres")
                             )
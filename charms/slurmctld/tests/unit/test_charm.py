@@ -17,187 +17,308 @@
 
 from unittest.mock import Mock, PropertyMock, patch
 
-from charm import SlurmctldCharm
+import pytest
+from constants import CHARM_MAINTAINED_CGROUP_CONF_PARAMETERS
 from ops.model import BlockedStatus
 from ops.testing import Harness
-from pyfakefs.fake_filesystem_unittest import TestCase
+from pyfakefs.fake_filesystem_unittest import Patcher
+from slurmutils.models import SlurmConfig
 
 from charms.hpc_libs.v0.slurm_ops import SlurmOpsError
 
 
-class TestCharm(TestCase):
-
-    def setUp(self):
-        self.harness = Harness(SlurmctldCharm)
-        self.addCleanup(self.harness.cleanup)
-        self.setUpPyfakefs()
-        self.harness.begin()
-
-    def test_cluster_name(self) -> None:
-        """Test that the _cluster_name property works."""
-        self.assertEqual(self.harness.charm._cluster_name, "osd-cluster")
-
-    def test_cluster_info(self) -> None:
-        """Test the cluster_info property works."""
-        self.assertEqual(type(self.harness.charm._cluster_name), str)
-
-    def test_is_slurm_installed(self) -> None:
-        """Test that the is_slurm_installed method works."""
-        setattr(self.harness.charm._stored, "slurm_installed", True)  # Patch StoredState
-        self.assertEqual(self.harness.charm.slurm_installed, True)
-
-    def test_is_slurm_not_installed(self) -> None:
-        """Test that the is_slurm_installed method works when slurm is not installed."""
-        setattr(self.harness.charm._stored, "slurm_installed", False)  # Patch StoredState
-        self.assertEqual(self.harness.charm.slurm_installed, False)
-
-    @patch("charm.SlurmctldCharm._on_write_slurm_conf")
-    @patch("ops.framework.EventBase.defer")
-    def test_install_success(self, defer, *_) -> None:
-        """Test `InstallEvent` hook when slurmctld installation succeeds."""
-        self.harness.set_leader(True)
-        self.harness.charm._slurmctld.install = Mock()
-        self.harness.charm._slurmctld.version = Mock(return_value="24.05.2-1")
-        self.harness.charm._slurmctld.jwt = Mock()
-        self.harness.charm._slurmctld.jwt.get.return_value = "=X="
-        self.harness.charm._slurmctld.munge = Mock()
-        self.harness.charm._slurmctld.munge.key.get.return_value = "=X="
-        self.harness.charm._slurmctld.exporter = Mock()
-        self.harness.charm._slurmctld.service = Mock()
-
-        self.harness.charm.on.install.emit()
-        defer.assert_not_called()
-
-    @patch("ops.framework.EventBase.defer")
-    def test_install_fail_ha_support(self, defer) -> None:
-        """Test `InstallEvent` hook when multiple slurmctld units are deployed.
-
-        Notes:
-            The slurmctld charm currently does not support high-availability so this
-            unit test validates that we properly handle if multiple slurmctld units
-            are deployed.
-        """
-        self.harness.set_leader(False)
-        self.harness.charm.on.install.emit()
-
-        defer.assert_called()
-        self.assertEqual(
-            self.harness.charm.unit.status,
-            BlockedStatus("slurmctld high-availability not supported"),
-        )
-
-    @patch("ops.framework.EventBase.defer")
-    def test_install_fail_slurmctld_package(self, defer) -> None:
-        """Test `InstallEvent` hook when slurmctld fails to install."""
-        self.harness.set_leader(True)
-        self.harness.charm._slurmctld.install = Mock(
-            side_effect=SlurmOpsError("failed to install slurmctld")
-        )
-        self.harness.charm.on.install.emit()
-
-        defer.assert_called()
-        self.assertEqual(
-            self.harness.charm.unit.status,
-            BlockedStatus("failed to install slurmctld. see logs for further details"),
-        )
-
-    def test_update_status_slurm_not_installed(self) -> None:
-        """Test `UpdateStatusEvent` hook when slurmctld is not installed."""
-        self.harness.charm.on.update_status.emit()
-        self.assertEqual(
-            self.harness.charm.unit.status,
-            BlockedStatus("failed to install slurmctld. see logs for further details"),
-        )
-
-    def test_get_munge_key(self) -> None:
-        """Test that the get_munge_key method works."""
-        setattr(self.harness.charm._stored, "munge_key", "=ABC=")  # Patch StoredState
-        self.assertEqual(self.harness.charm.get_munge_key(), "=ABC=")
-
-    def test_get_jwt_rsa(self) -> None:
-        """Test that the get_jwt_rsa method works."""
-        setattr(self.harness.charm._stored, "jwt_rsa", "=ABC=")  # Patch StoredState
-        self.assertEqual(self.harness.charm.get_jwt_rsa(), "=ABC=")
-
-    @patch("charm.SlurmctldCharm._check_status", return_value=False)
-    def test_on_slurmrestd_available_status_false(self, _) -> None:
-        """Test that the on_slurmrestd_available method works when _check_status is False."""
-        self.harness.charm._slurmrestd.on.slurmrestd_available.emit()
-
-    @patch("charm.SlurmctldCharm._check_status", return_value=False)
-    @patch("interface_slurmrestd.Slurmrestd.set_slurm_config_on_app_relation_data")
-    @patch("ops.framework.EventBase.defer")
-    def test_on_slurmrestd_available_no_config(self, defer, *_) -> None:
-        """Test that the on_slurmrestd_available method works if no slurm config is available."""
-        self.harness.set_leader(True)
-        self.harness.charm._slurmrestd.on.slurmrestd_available.emit()
-        defer.assert_called()
-
-    @patch("charm.SlurmctldCharm._check_status", return_value=True)
-    @patch("slurmutils.editors.slurmconfig.load")
-    @patch("interface_slurmrestd.Slurmrestd.set_slurm_config_on_app_relation_data")
-    def test_on_slurmrestd_available_if_available(self, *_) -> None:
-        """Test that the on_slurmrestd_available method works if slurm_config is available.
-
-        Notes:
-            This method is testing the _on_slurmrestd_available event handler
-            completes successfully.
-        """
-        self.harness.charm._stored.slurmrestd_available = True
-        self.harness.charm._slurmrestd.on.slurmrestd_available.emit()
-
-    def test_on_slurmdbd_available(self) -> None:
-        """Test that the on_slurmdbd_method works."""
-        self.harness.charm._slurmdbd.on.slurmdbd_available.emit("slurmdbdhost")
-        self.assertEqual(self.harness.charm._stored.slurmdbd_host, "slurmdbdhost")
-
-    def test_on_slurmdbd_unavailable(self) -> None:
-        """Test that the on_slurmdbd_unavailable method works."""
-        self.harness.charm._slurmdbd.on.slurmdbd_unavailable.emit()
-        self.assertEqual(self.harness.charm._stored.slurmdbd_host, "")
-
-    @patch(
-        "charms.hpc_libs.v0.slurm_ops.SlurmctldManager.hostname",
-        new_callable=PropertyMock(return_value="test_hostname"),
+@pytest.fixture(scope="session")
+def charm_cls():
+    """Return the slurmctld charm class.
+
+    The charm module and the relation interfaces it pulls in are imported here, when
+    tests start running, rather than during collection. ops, slurmutils and slurm_ops
+    are still imported at module level for the assertions.
+    """
+    from charm import SlurmctldCharm
+
+    return SlurmctldCharm
+
+
+@pytest.fixture
+def harness(charm_cls):
+    """Return a started `Harness` for the slurmctld charm backed by a fake filesystem."""
+    harness = Harness(charm_cls)
+    with Patcher(use_dynamic_patch=False):
+        harness.begin()
+        yield harness
+    harness.cleanup()
+
+
+@pytest.fixture
+def defer():
+    """Patch `EventBase.defer` and return the mock."""
+    with patch("ops.framework.EventBase.defer") as defer:
+        yield defer
+
+
+@pytest.fixture
+def check_status_false():
+    """Patch `SlurmctldCharm._check_status` to report that slurmctld is not ready."""
+    with patch("charm.SlurmctldCharm._check_status", return_value=False) as check_status:
+        yield check_status
+
+
+@pytest.fixture
+def check_status_true():
+    """Patch `SlurmctldCharm._check_status` to report that slurmctld is ready."""
+    with patch("charm.SlurmctldCharm._check_status", return_value=True) as check_status:
+        yield check_status
+
+
+@pytest.fixture
+def slurmctld() -> Mock:
+    """Return a mock `SlurmctldManager` that reports a successful installation."""
+    slurmctld = Mock()
+    slurmctld.version.return_value = "24.05.2-1"
+    slurmctld.jwt.get.return_value = "=X="
+    slurmctld.munge.key.get.return_value = "=X="
+    return slurmctld
+
+
+def test_cluster_name(harness) -> None:
+    """Test that the _cluster_name property works."""
+    cluster_name = harness.charm._cluster_name
+    assert type(cluster_name) is str
+    assert cluster_name == "osd-cluster"
+
+
+@pytest.mark.parametrize("installed", [True, False])
+def test_is_slurm_installed(harness, installed) -> None:
+    """Test that the is_slurm_installed method works."""
+    setattr(harness.charm._stored, "slurm_installed", installed)  # Patch StoredState
+    assert harness.charm.slurm_installed is installed
+
+
+@patch("charm.SlurmctldCharm._on_write_slurm_conf")
+def test_install_success(_, harness, defer, slurmctld) -> None:
+    """Test `InstallEvent` hook when slurmctld installation succeeds."""
+    harness.set_leader(True)
+    harness.charm._slurmctld = slurmctld
+
+    harness.charm.on.install.emit()
+    defer.assert_not_called()
+    assert harness.charm._stored.munge_key == "=X="
+
+
+def test_install_fail_ha_support(harness, defer) -> None:
+    """Test `InstallEvent` hook when multiple slurmctld units are deployed.
+
+    Notes:
+        The slurmctld charm currently does not support high-availability so this
+        unit test validates that we properly handle if multiple slurmctld units
+        are deployed.
+    """
+    harness.set_leader(False)
+    harness.charm.on.install.emit()
+
+    defer.assert_called()
+    assert harness.charm.unit.status == BlockedStatus("slurmctld high-availability not supported")
+
+
+def test_install_fail_slurmctld_package(harness, defer) -> None:
+    """Test `InstallEvent` hook when slurmctld fails to install."""
+    harness.set_leader(True)
+    harness.charm._slurmctld.install = Mock(
+        side_effect=SlurmOpsError("failed to install slurmctld")
+    )
+    harness.charm.on.install.emit()
+
+    defer.assert_called()
+    assert harness.charm.unit.status == BlockedStatus(
+        "failed to install slurmctld. see logs for further details"
     )
-    def test_sackd_on_relation_created(self, *_) -> None:
-        """Test that sackd relation is created successfully."""
-        self.harness.set_leader(True)
-        # Patch StoredState
-        setattr(self.harness.charm._stored, "slurm_installed", True)
-        setattr(self.harness.charm._stored, "munge_key", "=ABC=")
-
-        relation_id = self.harness.add_relation("login-node", "sackd")
-        self.assertEqual(
-            self.harness.get_relation_data(relation_id, "slurmctld")["cluster_info"],
-            '{"auth_key": "=ABC=", "slurmctld_host": "test_hostname"}',
-        )
-
-    @patch("ops.framework.EventBase.defer")
-    def test_sackd_fail_on_relation_created(self, defer) -> None:
-        """Test sackd relation when slurm is not installed."""
-        setattr(self.harness.charm._stored, "slurm_installed", False)  # Patch StoredState
-        self.harness.add_relation("login-node", "sackd")
-        defer.asset_called()
-
-    @patch("charm.is_container", return_value=True)
-    def test_get_user_supplied_parameters(self, *_) -> None:
-        """Test that user supplied parameters are parsed correctly."""
-        self.harness.add_relation("slurmd", "slurmd")
-        self.harness.add_relation("slurmctld-peer", self.harness.charm.app.name)
-        self.harness.update_config(
-            {"slurm-conf-parameters": "JobAcctGatherFrequency=task=30,network=40"}
-        )
-        self.assertEqual(
-            self.harness.charm._assemble_slurm_conf().job_acct_gather_frequency,
-            "task=30,network=40",
-        )
-
-    def test_resume_nodes_valid_input(self) -> None:
-        """Test that the _resume_nodes method provides a valid scontrol command."""
-        self.harness.charm._slurmctld.scontrol = Mock()
-        self.harness.charm._resume_nodes(["juju-123456-1", "tester-node", "node-three"])
-        args, _ = self.harness.charm._slurmctld.scontrol.call_args
-        self.assertEqual(
-            args, ("update", "nodename=juju-123456-1,tester-node,node-three", "state=resume")
-        )
+
+
+def test_update_status_slurm_not_installed(harness) -> None:
+    """Test `UpdateStatusEvent` hook when slurmctld is not installed."""
+    harness.charm.on.update_status.emit()
+    assert harness.charm.unit.status == BlockedStatus(
+        "failed to install slurmctld. see logs for further details"
+    )
+
+
+def test_get_munge_key(harness) -> None:
+    """Test that the get_munge_key method works."""
+    setattr(harness.charm._stored, "munge_key", "=ABC=")  # Patch StoredState
+    assert harness.charm.get_munge_key() == "=ABC="
+
+
+def test_get_jwt_rsa(harness) -> None:
+    """Test that the get_jwt_rsa method works."""
+    setattr(harness.charm._stored, "jwt_rsa", "=ABC=")  # Patch StoredState
+    assert harness.charm.get_jwt_rsa() == "=ABC="
+
+
+def test_on_slurmrestd_available_status_false(harness, check_status_false) -> None:
+    """Test that the on_slurmrestd_available method works when _check_status is False."""
+    harness.charm._slurmrestd.on.slurmrestd_available.emit()
+
+
+@patch("interface_slurmrestd.Slurmrestd.set_slurm_config_on_app_relation_data")
+def test_on_slurmrestd_available_no_config(_, harness, defer, check_status_false) -> None:
+    """Test that the on_slurmrestd_available method works if no slurm config is available."""
+    harness.set_leader(True)
+    harness.charm._slurmrestd.on.slurmrestd_available.emit()
+    defer.assert_called()
+
+
+@patch("slurmutils.editors.slurmconfig.load")
+@patch("interface_slurmrestd.Slurmrestd.set_slurm_config_on_app_relation_data")
+def test_on_slurmrestd_available_if_available(_, __, harness, check_status_true) -> None:
+    """Test that the on_slurmrestd_available method works if slurm_config is available.
+
+    Notes:
+        This method is testing the _on_slurmrestd_available event handler
+        completes successfully.
+    """
+    harness.charm._stored.slurmrestd_available = True
+    harness.charm._slurmrestd.on.slurmrestd_available.emit()
+
+
+def test_on_slurmdbd_available(harness) -> None:
+    """Test that the on_slurmdbd_method works."""
+    harness.charm._slurmdbd.on.slurmdbd_available.emit("slurmdbdhost")
+    assert harness.charm._stored.slurmdbd_host == "slurmdbdhost"
+
+
+def test_on_slurmdbd_unavailable(harness) -> None:
+    """Test that the on_slurmdbd_unavailable method works."""
+    harness.charm._slurmdbd.on.slurmdbd_unavailable.emit()
+    assert harness.charm._stored.slurmdbd_host == ""
+
+
+@patch(
+    "charms.hpc_libs.v0.slurm_ops.SlurmctldManager.hostname",
+    new_callable=PropertyMock(return_value="test_hostname"),
+)
+def test_sackd_on_relation_created(_, harness) -> None:
+    """Test that sackd relation is created successfully."""
+    harness.set_leader(True)
+    # Patch StoredState
+    setattr(harness.charm._stored, "slurm_installed", True)
+    setattr(harness.charm._stored, "munge_key", "=ABC=")
+
+    relation_id = harness.add_relation("login-node", "sackd")
+    assert (
+        harness.get_relation_data(relation_id, "slurmctld")["cluster_info"]
+        == '{"auth_key": "=ABC=", "slurmctld_host": "test_hostname"}'
+    )
+
+
+def test_sackd_fail_on_relation_created(harness, defer) -> None:
+    """Test sackd relation when slurm is not installed."""
+    setattr(harness.charm._stored, "slurm_installed", False)  # Patch StoredState
+    harness.add_relation("login-node", "sackd")
+    defer.assert_called_once()
+
+
+@patch("charm.is_container", return_value=True)
+def test_get_user_supplied_parameters(_, harness) -> None:
+    """Test that user supplied parameters are parsed correctly."""
+    harness.add_relation("slurmd", "slurmd")
+    harness.add_relation("slurmctld-peer", harness.charm.app.name)
+    harness.update_config({"slurm-conf-parameters": "JobAcctGatherFrequency=task=30,network=40"})
+    assert harness.charm._assemble_slurm_conf().job_acct_gather_frequency == "task=30,network=40"
+
+
+@patch("charm.SlurmctldCharm._on_write_slurm_conf")
+def test_config_changed_unchanged(write_slurm_conf, harness) -> None:
+    """Test that config-changed is skipped if the charm configuration is unchanged."""
+    harness.update_config({"slurm-conf-parameters": "MaxJobCount=20000"})
+    write_slurm_conf.assert_called_once()
+
+    harness.charm.on.config_changed.emit()
+    write_slurm_conf.assert_called_once()
+
+
+@patch("charm.is_container", return_value=True)
+def test_get_user_supplied_slurmctld_parameters(_, harness) -> None:
+    """Test that user supplied SlurmctldParameters are merged with the charm's own."""
+    harness.add_relation("slurmd", "slurmd")
+    harness.add_relation("slurmctld-peer", harness.charm.app.name)
+    harness.update_config(
+        {"slurm-conf-parameters": "SlurmctldParameters=idle_on_node_suspend=true"}
+    )
+    assert harness.charm._assemble_slurm_conf().slurmctld_parameters == {
+        "enable_configless": True,
+        "idle_on_node_suspend": "true",
+    }
+
+
+@patch("charm.is_container", return_value=True)
+def test_get_user_supplied_slurmctld_parameters_flags(_, harness) -> None:
+    """Test that flag-only SlurmctldParameters are merged with the charm's own."""
+    harness.add_relation("slurmd", "slurmd")
+    harness.add_relation("slurmctld-peer", harness.charm.app.name)
+    harness.update_config(
+        {"slurm-conf-parameters": "SlurmctldParameters=enable_configless,idle_on_node_suspend"}
+    )
+    assert harness.charm._assemble_slurm_conf().slurmctld_parameters == {
+        "enable_configless": True,
+        "idle_on_node_suspend": True,
+    }
+
+
+@patch("charm.SlurmctldCharm._is_container", new_callable=PropertyMock, return_value=False)
+def test_write_cgroup_conf_does_not_mutate_defaults(_, harness, check_status_true) -> None:
+    """Test that user supplied cgroup parameters don't leak into the charm defaults."""
+    harness.set_leader(True)
+    harness.charm._assemble_slurm_conf = Mock(return_value=SlurmConfig())
+    harness.charm._slurmctld = Mock()
+    harness.update_config({"cgroup-parameters": "ConstrainCores=no"})
+    harness.charm._on_write_slurm_conf(Mock())
+
+    cgroup_config = harness.charm._slurmctld.cgroup.dump.call_args.args[0]
+    assert cgroup_config.constrain_cores == "no"
+    assert CHARM_MAINTAINED_CGROUP_CONF_PARAMETERS["ConstrainCores"] == "yes"
+
+
+def test_resume_nodes_valid_input(harness) -> None:
+    """Test that the _resume_nodes method provides a valid scontrol command."""
+    harness.charm._slurmctld.scontrol = Mock()
+    harness.charm._resume_nodes(["juju-123456-1", "tester-node", "node-three"])
+    harness.charm._slurmctld.scontrol.assert_called_once_with(
+        "update", "nodename=juju-123456-1,tester-node,node-three", "state=resume"
+    )
+
+
+def test_resume_nodes_reconfigure(harness) -> None:
+    """Test that _resume_nodes reconfigures and resumes in a single scontrol invocation."""
+    harness.charm._slurmctld.scontrol = Mock()
+    harness.charm._resume_nodes(["a", "b"], reconfigure=True)
+    harness.charm._slurmctld.scontrol.assert_called_once_with(
+        stdin="reconfigure\nupdate nodename=a,b state=resume\n"
+    )
+
+
+@patch("charm.SlurmctldCharm._is_container", new_callable=PropertyMock, return_value=True)
+def test_write_slurm_conf_resumes_transitioning_nodes(_, harness, check_status_true) -> None:
+    """Test that transitioning nodes are resumed together with the reconfigure."""
+    harness.set_leader(True)
+    harness.charm._assemble_slurm_conf = Mock(return_value=SlurmConfig())
+    harness.charm._slurmctld = Mock()
+    harness.charm._stored.new_nodes = ["a", "b"]
+    harness.charm._on_write_slurm_conf(Mock())
+
+    harness.charm._slurmctld.scontrol.assert_called_once_with(
+        stdin="reconfigure\nupdate nodename=a,b state=resume\n"
+    )
+    assert harness.charm.new_nodes == []
+
+
+@patch("charm.SlurmctldCharm._is_container", new_callable=PropertyMock, return_value=True)
+def test_write_slurm_conf_reconfigure(_, harness, check_status_true) -> None:
+    """Test that slurmctld is only reconfigured if there are no transitioning nodes."""
+    harness.set_leader(True)
+    harness.charm._assemble_slurm_conf = Mock(return_value=SlurmConfig())
+    harness.charm._slurmctld = Mock()
+    harness.charm._stored.new_nodes = []
+    harness.charm._on_write_slurm_conf(Mock())
+
+    harness.charm._slurmctld.scontrol.assert_called_once_with("reconfigure")
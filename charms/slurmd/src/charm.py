@@ -4,6 +4,7 @@
 
 """Slurmd Operator Charm."""
 
+import functools
 import logging
 from pathlib import Path
 from typing import Any, Dict, cast
@@ -34,6 +35,9 @@ from charms.operator_libs_linux.v0.juju_systemd_notices import (  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+_PARTITION_KEYS = frozenset(PartitionOptionSet.keys())
+_NODE_KEYS = frozenset(NodeOptionSet.keys())
+
 
 class SlurmdCharm(CharmBase):
     """Slurmd lifecycle events."""
@@ -112,24 +116,23 @@ class SlurmdCharm(CharmBase):
                 self._stored.nhc_conf = nhc_conf
                 nhc.generate_config(nhc_conf)
 
-        user_supplied_partition_parameters = self.model.config.get("partition-config")
-
+        # Only the leader sets the partition configuration, so skip parsing it on other units.
         if self.model.unit.is_leader():
+            user_supplied_partition_parameters = self.model.config.get("partition-config")
             if user_supplied_partition_parameters is not None:
-                try:
-                    tmp_params = {
-                        item.split("=")[0]: item.split("=")[1]
-                        for item in str(user_supplied_partition_parameters).split()
-                    }
-                except IndexError:
-                    logger.error(
-                        "Error parsing partition-config. Please use KEY1=VALUE KEY2=VALUE."
-                    )
-                    return
+                tmp_params = {}
+                for item in str(user_supplied_partition_parameters).split():
+                    key, sep, value = item.partition("=")
+                    if not sep or not value:
+                        logger.error(
+                            "Error parsing partition-config. Please use KEY1=VALUE KEY2=VALUE."
+                        )
+                        return
+                    tmp_params[key] = value
 
                 # Validate the user supplied params are valid params.
                 for parameter in tmp_params:
-                    if parameter not in list(PartitionOptionSet.keys()):
+                    if parameter not in _PARTITION_KEYS:
                         logger.error(
                             f"Invalid user supplied partition configuration parameter: {parameter}."
                         )
@@ -150,11 +153,14 @@ class SlurmdCharm(CharmBase):
             event.defer()
             return
 
+        # Only restart munged and slurmd if the event data differs from what is already stored.
+        changed = False
         if (slurmctld_host := event.slurmctld_host) != self._stored.slurmctld_host:
             if slurmctld_host is not None:
                 self._slurmd.config_server = f"{slurmctld_host}:6817"
                 self._stored.slurmctld_host = slurmctld_host
                 logger.debug(f"slurmctld_host={slurmctld_host}")
+                changed = True
             else:
                 logger.debug("'slurmctld_host' not in event data.")
                 return
@@ -163,6 +169,7 @@ class SlurmdCharm(CharmBase):
             if munge_key is not None:
                 self._stored.munge_key = munge_key
                 self._slurmd.munge.key.set(munge_key)
+                changed = True
             else:
                 logger.debug("'munge_key' not in event data.")
                 return
@@ -172,6 +179,7 @@ class SlurmdCharm(CharmBase):
                 self._stored.nhc_params = nhc_params
                 nhc.generate_wrapper(nhc_params)
                 logger.debug(f"nhc_params={nhc_params}")
+                changed = True
             else:
                 logger.debug("'nhc_params' not in event data.")
                 return
@@ -179,6 +187,11 @@ class SlurmdCharm(CharmBase):
         logger.debug("#### Storing slurmctld_available event relation data in charm StoredState.")
         self._stored.slurmctld_available = True
 
+        if not changed:
+            logger.debug("slurmctld_available event data unchanged. skipping restart.")
+            self._check_status()
+            return
+
         # Restart munged and slurmd after we write the event data to their respective locations.
         try:
             self._slurmd.munge.service.restart()
@@ -193,11 +206,13 @@ class SlurmdCharm(CharmBase):
     def _on_slurmctld_unavailable(self, _) -> None:
         """Stop slurmd and set slurmctld_available = False when we lose slurmctld."""
         logger.debug("## Slurmctld unavailable")
+        # Stop slurmd before clearing the slurmctld data so that a failure to
+        # disable the service doesn't leave the stored state partially cleared.
+        self._slurmd.service.disable()
         self._stored.slurmctld_available = False
         self._stored.nhc_params = ""
         self._stored.munge_key = ""
         self._stored.slurmctld_host = ""
-        self._slurmd.service.disable()
         self._check_status()
 
     def _on_slurmd_started(self, _: ServiceStartedEvent) -> None:
@@ -238,26 +253,23 @@ class SlurmdCharm(CharmBase):
 
             # Parse the user supplied node-config.
             node_parameters_tmp = {}
-            try:
-                node_parameters_tmp = {
-                    item.split("=")[0]: item.split("=")[1]
-                    for item in user_supplied_node_parameters.split()
-                }
-            except IndexError:
-                logger.error(
-                    "Invalid node parameters specified. Please use KEY1=VAL KEY2=VAL format."
-                )
-                valid_config = False
-
-            # Validate the user supplied params are valid params.
-            for param in node_parameters_tmp:
-                if param not in list(NodeOptionSet.keys()):
-                    logger.error(f"Invalid user supplied node parameter: {param}.")
+            for item in user_supplied_node_parameters.split():
+                key, sep, value = item.partition("=")
+                if not sep:
+                    logger.error(
+                        "Invalid node parameters specified. Please use KEY1=VAL KEY2=VAL format."
+                    )
+                    node_parameters_tmp = {}
                     valid_config = False
+                    break
+                node_parameters_tmp[key] = value
 
-            # Validate the user supplied params have valid keys.
+            # Validate the user supplied params are valid params with non-empty values.
             for k, v in node_parameters_tmp.items():
-                if v == "":
+                if k not in _NODE_KEYS:
+                    logger.error(f"Invalid user supplied node parameter: {k}.")
+                    valid_config = False
+                elif v == "":
                     logger.error(f"Invalid user supplied node parameter: {k}={v}.")
                     valid_config = False
 
@@ -268,7 +280,7 @@ class SlurmdCharm(CharmBase):
 
         results = {
             "node-parameters": " ".join(
-                [f"{k}={v}" for k, v in self.get_node()["node_parameters"].items()]
+                f"{k}={v}" for k, v in self.get_node()["node_parameters"].items()
             )
         }
 
@@ -277,7 +289,7 @@ class SlurmdCharm(CharmBase):
 
         event.set_results(results)
 
-    @property
+    @functools.cached_property
     def hostname(self) -> str:
         """Return the hostname."""
         return self._slurmd.hostname
@@ -295,7 +307,7 @@ class SlurmdCharm(CharmBase):
     @property
     def _new_node(self) -> bool:
         """Get the new_node from stored state."""
-        return True if self._stored.new_node is True else False
+        return bool(self._stored.new_node)
 
     @_new_node.setter
     def _new_node(self, new_node: bool) -> None:
@@ -339,9 +351,11 @@ class SlurmdCharm(CharmBase):
 
     def get_node(self) -> Dict[Any, Any]:
         """Get the node from stored state."""
-        slurmd_info = machine.get_slurmd_info()
+        # Copy the cached machine info as the GPU Gres entries are added to it below.
+        slurmd_info = dict(machine.get_slurmd_info())
 
         gres_info = []
+        gres = list(cast(list[str], slurmd_info.get("Gres", [])))
         if gpus := gpu.get_all_gpu():
             for model, devices in gpus.items():
                 # Build gres.conf line for this GPU model.
@@ -357,9 +371,10 @@ class SlurmdCharm(CharmBase):
                     "File": f"/dev/nvidia{device_suffix}",
                 }
                 gres_info.append(gres_line)
-                slurmd_info["Gres"] = cast(list[str], slurmd_info.get("Gres", [])) + [
-                    f"gpu:{model}:{len(devices)}"
-                ]
+                gres.append(f"gpu:{model}:{len(devices)}")
+
+        if gres:
+            slurmd_info["Gres"] = gres
 
         node = {
             "node_parameters": {
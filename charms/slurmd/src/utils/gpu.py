@@ -14,17 +14,22 @@
 
 """Manage GPU driver installation on compute node."""
 
+import atexit
+import functools
 import logging
+import re
+from pathlib import Path
 
-# ubuntu-drivers requires apt_pkg for package operations
-import apt_pkg  # pyright: ignore [reportMissingImports]
-import pynvml
-import UbuntuDrivers.detect  # pyright: ignore [reportMissingImports]
-
-import charms.operator_libs_linux.v0.apt as apt
+# Most hooks never touch the GPU, so `apt_pkg`, `pynvml`, `UbuntuDrivers`, and the apt
+# charm library are imported inside the functions that need them rather than here.
 
 _logger = logging.getLogger(__name__)
 
+_nvml_initialized = False
+
+_NVIDIA_PCI_VENDOR_ID = "0x10de"
+_WHITESPACE = re.compile(r"\s+")
+
 
 class GPUOpsError(Exception):
     """Exception raised when a GPU driver installation operation failed."""
@@ -40,10 +45,18 @@ class GPUDriverDetector:
 
     def __init__(self):
         """Initialize detection interfaces."""
+        # ubuntu-drivers requires apt_pkg for package operations
+        import apt_pkg  # pyright: ignore [reportMissingImports]
+
         apt_pkg.init()
+        # Building the apt cache parses every package list, so only build it once and
+        # only if a recommended driver needs its modules metapackage resolved.
+        self._cache = None
 
     def _system_gpgpu_driver_packages(self) -> dict:
         """Detect the available GPGPU drivers for this node."""
+        import UbuntuDrivers.detect  # pyright: ignore [reportMissingImports]
+
         return UbuntuDrivers.detect.system_gpgpu_driver_packages()
 
     def _get_linux_modules_metapackage(self, driver) -> str:
@@ -51,7 +64,13 @@ class GPUDriverDetector:
 
         e.g. linux-modules-nvidia-535-server-aws for driver nvidia-driver-535-server
         """
-        return UbuntuDrivers.detect.get_linux_modules_metapackage(apt_pkg.Cache(None), driver)
+        import apt_pkg  # pyright: ignore [reportMissingImports]
+        import UbuntuDrivers.detect  # pyright: ignore [reportMissingImports]
+
+        if self._cache is None:
+            self._cache = apt_pkg.Cache(None)
+
+        return UbuntuDrivers.detect.get_linux_modules_metapackage(self._cache, driver)
 
     def system_packages(self) -> list[str]:
         """Return a list of GPU drivers and kernel module packages for this node."""
@@ -59,22 +78,34 @@ class GPUDriverDetector:
 
         # Gather list of driver and kernel modules to install.
         install_packages = []
-        for driver_package in packages:
+        for driver_package, info in packages.items():
 
             # Ignore drivers that are not recommended
-            if packages[driver_package].get("recommended"):
+            if info.get("recommended"):
                 # Retrieve metapackage for this driver,
                 # e.g. nvidia-headless-no-dkms-535-server for nvidia-driver-535-server
-                driver_metapackage = packages[driver_package]["metapackage"]
+                driver_metapackage = info["metapackage"]
 
                 # Retrieve modules metapackage for combination of current kernel and recommended driver,
                 # e.g. linux-modules-nvidia-535-server-aws
                 modules_metapackage = self._get_linux_modules_metapackage(driver_package)
 
-                # Add to list of packages to install
-                install_packages += [driver_metapackage, modules_metapackage]
+                # Add any resolved packages to list of packages to install
+                install_packages.extend(p for p in (driver_metapackage, modules_metapackage) if p)
+
+        return install_packages
+
 
-        return [p for p in install_packages if p]
+def _has_nvidia_pci() -> bool:
+    """Check if any NVIDIA PCI devices are present on this node."""
+    for vendor in Path("/sys/bus/pci/devices").glob("*/vendor"):
+        try:
+            if vendor.read_text().strip() == _NVIDIA_PCI_VENDOR_ID:
+                return True
+        except OSError:
+            continue
+
+    return False
 
 
 def autoinstall() -> None:
@@ -83,7 +114,14 @@ def autoinstall() -> None:
     Raises:
         GPUOpsError: Raised if error is encountered during package install.
     """
+    import charms.operator_libs_linux.v0.apt as apt
+
     _logger.info("detecting GPUs and installing drivers")
+    # Driver detection builds the apt cache, so skip it entirely on nodes without NVIDIA GPUs.
+    if not _has_nvidia_pci():
+        _logger.info("no NVIDIA GPUs detected")
+        return
+
     detector = GPUDriverDetector()
     install_packages = detector.system_packages()
 
@@ -98,9 +136,30 @@ def autoinstall() -> None:
         raise GPUOpsError(f"failed to install packages {install_packages}. reason: {e}")
 
 
+def _nvml_init() -> None:
+    """Initialize NVML once for the lifetime of the process.
+
+    NVML is shut down when the process exits rather than after every query.
+
+    Raises:
+        pynvml.NVMLError: Raised if NVML cannot be initialized.
+    """
+    global _nvml_initialized
+    import pynvml
+
+    if not _nvml_initialized:
+        pynvml.nvmlInit()
+        atexit.register(pynvml.nvmlShutdown)
+        _nvml_initialized = True
+
+
+@functools.lru_cache(maxsize=1)
 def get_all_gpu() -> dict[str, list[int]]:
     """Get the GPU devices on this node.
 
+    The result is cached for the lifetime of the process as the GPU topology
+    cannot change while a hook is running. Callers must not mutate it.
+
     Returns:
         A dict mapping model names to a list of device minor numbers. Model names are lowercase
         with whitespace replaced by underscores. For example:
@@ -110,10 +169,12 @@ def get_all_gpu() -> dict[str, list[int]]:
         represents a node with two Tesla T4 GPUs at /dev/nvidia0 and /dev/nvidia1, and two L40S
         GPUs at /dev/nvidia2 and /dev/nvidia3.
     """
+    import pynvml
+
     gpu_info = {}
 
     try:
-        pynvml.nvmlInit()
+        _nvml_init()
     except pynvml.NVMLError as e:
         _logger.info("no GPU info gathered: drivers cannot be detected")
         _logger.debug("NVML init failed with reason: %s", e)
@@ -128,10 +189,9 @@ def get_all_gpu() -> dict[str, list[int]]:
         # Aims to follow convention set by Slurm autodetect:
         # https://slurm.schedmd.com/gres.html#AutoDetect
         model = pynvml.nvmlDeviceGetName(handle)
-        model = "_".join(model.split()).lower()
+        model = _WHITESPACE.sub("_", model.strip()).lower()
 
         minor_number = pynvml.nvmlDeviceGetMinorNumber(handle)
-        gpu_info[model] = gpu_info.get(model, []) + [minor_number]
+        gpu_info.setdefault(model, []).append(minor_number)
 
-    pynvml.nvmlShutdown()
     return gpu_info
@@ -14,15 +14,20 @@
 
 """Query information about the underlying Juju machine."""
 
+import functools
 import logging
 import subprocess
 
 _logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def get_slurmd_info() -> dict[str, str | list[str]]:
     """Get machine info as reported by `slurmd -C`.
 
+    The result is cached for the lifetime of the process as the machine
+    configuration cannot change while a hook is running. Callers must not mutate it.
+
     For details see: https://slurm.schedmd.com/slurmd.html
     """
     try:
@@ -31,13 +36,8 @@ def get_slurmd_info() -> dict[str, str | list[str]]:
         _logger.error(e)
         raise
 
-    info = {}
-    for opt in r.split()[:-1]:
-        k, v = opt.split("=")
-        if k == "Gres":
-            info[k] = v.split(",")
-            continue
-
-        info[k] = v
-
-    return info
+    # The last token of `slurmd -C` output is the uptime, which is not a node parameter.
+    return {
+        k: v.split(",") if k == "Gres" else v
+        for k, _, v in (opt.partition("=") for opt in r.split()[:-1])
+    }
@@ -17,16 +17,42 @@
 import logging
 import subprocess
 import tempfile
-import textwrap
 from pathlib import Path
+from typing import Sequence
 
 _logger = logging.getLogger(__name__)
 
+_NHC_TARBALL = "lbnl-nhc-1.4.3.tar.gz"
+_NHC_BUILD_ENV = {"LC_ALL": "C", "LANG": "C.UTF-8"}
+_NHC_AUTOGEN_CMD = ("./autogen.sh", "--prefix=/usr", "--sysconfdir=/etc", "--libexecdir=/usr/lib")
+_NHC_TEST_CMD = ("make", "test")
+_NHC_INSTALL_CMD = ("make", "install")
+_NHC_WRAPPER_TEMPLATE = "#!/usr/bin/env bash\n\n/usr/sbin/nhc-wrapper {params}\n"
+
 
 class Error(Exception):
     """Exception raised when a nhc operation failed."""
 
 
+def _run(cmd: Sequence[str], **kwargs) -> None:
+    """Run a build command, streaming its combined output to the debug log.
+
+    Raises:
+        subprocess.CalledProcessError: Raised if the command exits with a non-zero status.
+    """
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, **kwargs
+    ) as p:
+        # The output still has to be drained when debug logging is disabled.
+        debug = _logger.isEnabledFor(logging.DEBUG)
+        for line in p.stdout or ():
+            if debug:
+                _logger.debug("%s", line.rstrip())
+
+    if p.returncode != 0:
+        raise subprocess.CalledProcessError(p.returncode, cmd)
+
+
 def install() -> None:
     """Install nhc on compute node.
 
@@ -36,46 +62,19 @@ def install() -> None:
     _logger.info("installing node health check (nhc)")
     with tempfile.TemporaryDirectory() as tmpdir:
         try:
-            env = {"LC_ALL": "C", "LANG": "C.UTF-8"}
-
             _logger.info("extracting nhc tarball")
-            r = subprocess.check_output(
-                [
-                    "tar",
-                    "--extract",
-                    "--directory",
-                    tmpdir,
-                    "--file",
-                    "lbnl-nhc-1.4.3.tar.gz",
-                    "--strip",
-                    "1",
-                ],
-                stderr=subprocess.STDOUT,
-                text=True,
+            _run(
+                ["tar", "--extract", "--directory", tmpdir, "--file", _NHC_TARBALL, "--strip", "1"]
             )
-            _logger.debug(r)
 
             _logger.info("building nhc with autotools")
-            r = subprocess.check_output(
-                ["./autogen.sh", "--prefix=/usr", "--sysconfdir=/etc", "--libexecdir=/usr/lib"],
-                cwd=tmpdir,
-                env=env,
-                stderr=subprocess.STDOUT,
-                text=True,
-            )
-            _logger.debug(r)
+            _run(_NHC_AUTOGEN_CMD, cwd=tmpdir, env=_NHC_BUILD_ENV)
 
             _logger.info("testing nhc build")
-            r = subprocess.check_output(
-                ["make", "test"], cwd=tmpdir, env=env, stderr=subprocess.STDOUT, text=True
-            )
-            _logger.debug(r)
+            _run(_NHC_TEST_CMD, cwd=tmpdir, env=_NHC_BUILD_ENV)
 
             _logger.info("installing nhc")
-            r = subprocess.check_output(
-                ["make", "install"], cwd=tmpdir, env=env, stderr=subprocess.STDOUT, text=True
-            )
-            _logger.debug(r)
+            _run(_NHC_INSTALL_CMD, cwd=tmpdir, env=_NHC_BUILD_ENV)
         except subprocess.CalledProcessError as e:
             _logger.error("failed to install nhc. reason: %s", e)
             raise
@@ -104,7 +103,7 @@ def generate_config(nhc_config: str) -> None:
     try:
         Path("/etc/nhc/nhc.conf").write_text(nhc_config)
     except FileNotFoundError as e:
-        _logger.error(f"error rendering nhc.conf: {e}")
+        _logger.error("error rendering nhc.conf: %s", e)
         raise
 
 
@@ -116,13 +115,5 @@ def generate_wrapper(params: str) -> None:
     """
     _logger.debug("generating /usr/sbin/charmed-hpc-nhc-wrapper")
     target = Path("/usr/sbin/charmed-hpc-nhc-wrapper")
-    target.write_text(
-        textwrap.dedent(
-            f"""
-            #!/usr/bin/env bash
-
-            /usr/sbin/nhc-wrapper {params}
-            """
-        ).strip()
-    )
+    target.write_text(_NHC_WRAPPER_TEMPLATE.format(params=params))
     target.chmod(0o755)
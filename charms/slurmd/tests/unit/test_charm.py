@@ -24,6 +24,7 @@ from charm import SlurmdCharm
 from ops.model import ActiveStatus, BlockedStatus
 from ops.testing import Harness
 from pyfakefs.fake_filesystem_unittest import TestCase
+from utils import gpu, machine
 
 from charms.hpc_libs.v0.slurm_ops import SlurmOpsError
 
@@ -37,6 +38,9 @@ class TestCharm(TestCase):
         self.addCleanup(self.harness.cleanup)
         self.setUpPyfakefs()
         self.harness.begin()
+        # Machine and GPU detection results are cached per process, so reset them between tests.
+        gpu.get_all_gpu.cache_clear()
+        machine.get_slurmd_info.cache_clear()
 
     def test_config_changed_fail(self) -> None:
         """Test config_changed failure behavior."""
@@ -44,6 +48,15 @@ class TestCharm(TestCase):
         self.harness.update_config({"partition-config": "FAILEVAL"})
         self.assertEqual(self.harness.charm._stored.user_supplied_partition_parameters, {})
 
+    def test_config_changed_value_with_equals(self) -> None:
+        """Test that config_changed keeps `=` characters within parameter values."""
+        self.harness.set_leader(True)
+        self.harness.update_config({"partition-config": "TRESBillingWeights=CPU=1.0,Mem=0.25G"})
+        self.assertEqual(
+            self.harness.charm._stored.user_supplied_partition_parameters,
+            {"TRESBillingWeights": "CPU=1.0,Mem=0.25G"},
+        )
+
     @patch("ops.framework.EventBase.defer")
     def test_config_changed_success(self, defer) -> None:
         """Test config_changed success behavior."""
@@ -64,6 +77,7 @@ class TestCharm(TestCase):
         self.harness.charm._slurmd.version = Mock(return_value="24.05.2-1")
 
         # GPU detection test setup
+        self.fs.create_file("/sys/bus/pci/devices/0000:00:1e.0/vendor", contents="0x10de\n")
         metapackage = "headless-no-dkms-535-server"
         linux_modules = "linux-modules-535-server"
         detect_mock.system_gpgpu_driver_packages.return_value = {
@@ -77,6 +91,23 @@ class TestCharm(TestCase):
         self.assertTrue(self.harness.charm._stored.slurm_installed)
         defer.assert_not_called()
 
+    @patch("utils.nhc.install")
+    @patch("utils.service.override_service")
+    @patch("charms.operator_libs_linux.v0.juju_systemd_notices.SystemdNotices.subscribe")
+    @patch("charms.operator_libs_linux.v0.apt.add_package")
+    def test_install_no_nvidia_gpu(self, apt_mock, *_) -> None:
+        """Test that GPU driver detection is skipped on nodes without NVIDIA devices."""
+        self.harness.charm._slurmd.install = Mock()
+        self.harness.charm._slurmd.version = Mock(return_value="24.05.2-1")
+        self.fs.create_file("/sys/bus/pci/devices/0000:00:02.0/vendor", contents="0x8086\n")
+        detect_mock.system_gpgpu_driver_packages.reset_mock()
+
+        self.harness.charm.on.install.emit()
+
+        detect_mock.system_gpgpu_driver_packages.assert_not_called()
+        apt_mock.assert_not_called()
+        self.assertTrue(self.harness.charm._stored.slurm_installed)
+
     @patch("ops.framework.EventBase.defer")
     def test_install_fail(self, defer) -> None:
         """Test install failure behavior."""
@@ -157,6 +188,23 @@ class TestCharm(TestCase):
         self.assertTrue(self.harness.charm._check_status())
         self.assertEqual(self.harness.charm.unit.status, ActiveStatus())
 
+    def test_slurmctld_available_unchanged(self) -> None:
+        """Test that slurmd is not restarted if the slurmctld data is unchanged."""
+        self.harness.charm._stored.slurm_installed = True
+        self.harness.charm._stored.munge_key = "=ABC="
+        self.harness.charm._stored.nhc_params = "-X"
+        self.harness.charm._stored.slurmctld_host = "slurmctld-0"
+        self.harness.charm._slurmd.munge = Mock()
+        self.harness.charm._slurmd.service = Mock()
+
+        self.harness.charm._slurmctld.on.slurmctld_available.emit(
+            munge_key="=ABC=", nhc_params="-X", slurmctld_host="slurmctld-0"
+        )
+
+        self.harness.charm._slurmd.munge.service.restart.assert_not_called()
+        self.harness.charm._slurmd.service.restart.assert_not_called()
+        self.assertTrue(self.harness.charm._stored.slurmctld_available)
+
     def test_update_status_install_fail(self) -> None:
         """Test `UpdateStateEvent` hook failure."""
         self.harness.charm.on.update_status.emit()
@@ -50,16 +50,16 @@ class SlurmdbdCharm(CharmBase):
         self._slurmctld = Slurmctld(self, "slurmctld")
         self._db = DatabaseRequires(self, relation_name="database", database_name=SLURM_ACCT_DB)
 
-        event_handler_bindings = {
-            self.on.install: self._on_install,
-            self.on.update_status: self._on_update_status,
-            self.on.config_changed: self._write_config_and_restart_slurmdbd,
-            self._db.on.database_created: self._on_database_created,
-            self._slurmctld.on.slurmctld_available: self._on_slurmctld_available,
-            self._slurmctld.on.slurmctld_unavailable: self._on_slurmctld_unavailable,
-        }
-        for event, handler in event_handler_bindings.items():
-            self.framework.observe(event, handler)
+        self.framework.observe(self.on.install, self._on_install)
+        self.framework.observe(self.on.update_status, self._on_update_status)
+        self.framework.observe(self.on.config_changed, self._write_config_and_restart_slurmdbd)
+        self.framework.observe(self._db.on.database_created, self._on_database_created)
+        self.framework.observe(
+            self._slurmctld.on.slurmctld_available, self._on_slurmctld_available
+        )
+        self.framework.observe(
+            self._slurmctld.on.slurmctld_unavailable, self._on_slurmctld_unavailable
+        )
 
     def _on_install(self, event: InstallEvent) -> None:
         """Perform installation operations for slurmdbd."""
@@ -142,7 +142,7 @@ class SlurmdbdCharm(CharmBase):
             self.unit.status = BlockedStatus("No database endpoints provided")
             raise ValueError(f"Unexpected endpoint types: {event.endpoints}")
 
-        for endpoint in [ep.strip() for ep in event.endpoints.split(",")]:
+        for endpoint in (ep.strip() for ep in event.endpoints.split(",")):
             if not endpoint:
                 continue
 
@@ -15,246 +15,228 @@
 
 """Test default charm events such as upgrade charm, install, etc."""
 
-from unittest.mock import Mock, PropertyMock, patch
+from unittest.mock import Mock
 
-from charm import SlurmdbdCharm
+import pytest
 from ops.model import ActiveStatus, BlockedStatus
 from ops.testing import Harness
-from pyfakefs.fake_filesystem_unittest import TestCase
-
-from charms.hpc_libs.v0.slurm_ops import SlurmOpsError
-
-
-class TestCharm(TestCase):
-
-    def setUp(self) -> None:
-        self.harness = Harness(SlurmdbdCharm)
-        self.addCleanup(self.harness.cleanup)
-        self.setUpPyfakefs()
-        self.harness.begin()
-
-    def test_install_success(self, *_) -> None:
-        """Test `InstallEvent` hook success."""
-        self.harness.set_leader(True)
-        self.harness.charm._slurmdbd.install = Mock()
-        self.harness.charm._slurmdbd.version = Mock(return_value="24.05.2.-1")
-        self.harness.charm._slurmdbd.munge.service.enable = Mock()
-        self.harness.charm._stored.db_info = {"rats": "123"}
-        self.harness.charm.on.install.emit()
-
-        self.assertEqual(self.harness.charm.unit.status, ActiveStatus())
-
-    @patch("ops.framework.EventBase.defer")
-    def test_install_fail_ha_support(self, defer) -> None:
-        """Test `InstallEvent` hook failure when there are multiple slurmdbd units.
-
-        Notes:
-            The slurmdbd charm currently does not support high-availability so this
-            unit test validates that we properly handle if multiple slurmdbd units
-            are deployed.
-        """
-        self.harness.set_leader(False)
-        self.harness.charm.on.install.emit()
-
-        self.assertEqual(
-            self.harness.charm.unit.status,
-            BlockedStatus(
-                "slurmdbd high-availability not supported. see logs for further details"
-            ),
-        )
-        defer.assert_called()
-
-    @patch("ops.framework.EventBase.defer")
-    def test_install_fail_slurmdbd_package(self, defer) -> None:
-        """Test `InstallEvent` hook when slurmdbd fails to install."""
-        self.harness.set_leader(True)
-        self.harness.charm._slurmdbd.install = Mock(
-            side_effect=SlurmOpsError("failed to install slurmd")
-        )
-        self.harness.charm.on.install.emit()
-
-        self.assertEqual(
-            self.harness.charm.unit.status,
-            BlockedStatus("failed to install slurmdbd. see logs for further details"),
-        )
-        defer.assert_called()
-
-    def test_update_status_fail(self) -> None:
-        """Test `UpdateStatusEvent` hook failure."""
-        self.harness.set_leader(True)
-        self.harness.charm.on.update_status.emit()
-
-        self.assertEqual(
-            self.harness.charm.unit.status,
-            BlockedStatus("failed to install slurmdbd. see logs for further details"),
-        )
-
-    @patch("charm.sleep")
-    def test_check_slurmdbd(self, *_) -> None:
-        """Test that `BlockedStatus` is set when slurmdbd service is not running."""
-        self.harness.charm._slurmdbd.service.active = Mock(return_value=False)
-        self.harness.charm._slurmdbd.service.restart = Mock()
-        self.harness.charm._check_slurmdbd(max_attemps=1)
-
-        self.assertEqual(self.harness.charm.unit.status, BlockedStatus("cannot start slurmdbd"))
-
-    def test_on_database_created_no_endpoints(self, *_) -> None:
-        """Tests that the on_database_created method errors with no endpoints."""
-        self.harness.set_leader(True)
-        event = Mock()
-        event.endpoints = None
-        self.assertRaises(ValueError, self.harness.charm._on_database_created, event)
-        self.assertEqual(
-            self.harness.charm.unit.status, BlockedStatus("No database endpoints provided")
-        )
-
-        event.endpoints = ""
-        self.assertRaises(ValueError, self.harness.charm._on_database_created, event)
-        self.assertEqual(
-            self.harness.charm.unit.status, BlockedStatus("No database endpoints provided")
-        )
-
-        event.endpoints = " , "
-        self.assertRaises(ValueError, self.harness.charm._on_database_created, event)
-        self.assertEqual(
-            self.harness.charm.unit.status, BlockedStatus("No database endpoints provided")
-        )
-
-    @patch("charm.SlurmdbdCharm._write_config_and_restart_slurmdbd")
-    @patch(
-        "charms.hpc_libs.v0.slurm_ops.SlurmdbdManager.mysql_unix_port", new_callable=PropertyMock
-    )
-    def test_on_database_created_socket_endpoints(
-        self, mysql_unix_port, _write_config_and_restart_slurmdbd
-    ) -> None:
-        """Tests socket endpoints update the environment file."""
-        event = Mock()
-        event.endpoints = "file:///path/to/some/socket"
-        event.username = "fake-user"
-        event.password = "fake-password"
-
-        self.harness.charm._on_database_created(event)
-
-        mysql_unix_port.assert_called_once_with("/path/to/some/socket")
-        db_info = {
-            "StorageUser": "fake-user",
-            "StoragePass": "fake-password",
-            "StorageLoc": "slurm_acct_db",
-        }
-        self.assertEqual(self.harness.charm._stored.db_info, db_info)
-        _write_config_and_restart_slurmdbd.assert_called_once_with(event)
-
-    @patch("charm.SlurmdbdCharm._write_config_and_restart_slurmdbd")
-    @patch(
-        "charms.hpc_libs.v0.slurm_ops.SlurmdbdManager.mysql_unix_port", new_callable=PropertyMock
-    )
-    def test_on_database_created_socket_multiple_endpoints(
-        self, mysql_unix_port, _write_config_and_restart_slurmdbd
-    ) -> None:
-        """Tests multiple socket endpoints only uses one endpoint."""
-        event = Mock()
-        event.username = "fake-user"
-        event.password = "fake-password"
-        # Note: also include some whitespace just to check.
-        event.endpoints = " file:///some/other/path, file:///path/to/some/socket "
-
-        self.harness.charm._on_database_created(event)
-
-        mysql_unix_port.assert_called_once_with("/some/other/path")
-        db_info = {
-            "StorageUser": "fake-user",
-            "StoragePass": "fake-password",
-            "StorageLoc": "slurm_acct_db",
-        }
-        self.assertEqual(self.harness.charm._stored.db_info, db_info)
-        _write_config_and_restart_slurmdbd.assert_called_once_with(event)
-
-    @patch("charm.SlurmdbdCharm._write_config_and_restart_slurmdbd")
-    @patch(
-        "charms.hpc_libs.v0.slurm_ops.SlurmdbdManager.mysql_unix_port", new_callable=PropertyMock
+
+from charms.hpc_libs.v0.slurm_ops import SlurmdbdManager, SlurmOpsError
+
+_BASE_DB_INFO = {
+    "StorageUser": "fake-user",
+    "StoragePass": "fake-password",
+    "StorageLoc": "slurm_acct_db",
+}
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch) -> None:
+    """Stop the slurmdbd service retry loop from sleeping in any test."""
+    monkeypatch.setattr("charm.sleep", lambda *_: None)
+
+
+@pytest.fixture(scope="session")
+def charm_cls():
+    """Return the slurmdbd charm class.
+
+    The charm module and the relation interfaces it pulls in are imported here, when
+    tests start running, rather than during collection. ops and slurm_ops are still
+    imported at module level for the assertions.
+    """
+    from charm import SlurmdbdCharm
+
+    return SlurmdbdCharm
+
+
+@pytest.fixture
+def harness(charm_cls):
+    """Return a started `Harness` for the slurmdbd charm."""
+    harness = Harness(charm_cls)
+    harness.begin()
+    yield harness
+    harness.cleanup()
+
+
+@pytest.fixture
+def slurmdbd() -> Mock:
+    """Return a mock `SlurmdbdManager` that reports a successful installation."""
+    slurmdbd = Mock()
+    slurmdbd.version.return_value = "24.05.2-1"
+    return slurmdbd
+
+
+@pytest.fixture
+def db_event() -> Mock:
+    """Return a mock `DatabaseCreatedEvent` carrying the database credentials."""
+    db_event = Mock()
+    db_event.username = "fake-user"
+    db_event.password = "fake-password"
+    return db_event
+
+
+@pytest.fixture
+def defer(monkeypatch) -> Mock:
+    """Patch `EventBase.defer` and return the mock."""
+    defer = Mock()
+    monkeypatch.setattr("ops.framework.EventBase.defer", defer)
+    return defer
+
+
+@pytest.fixture
+def write_config(monkeypatch) -> Mock:
+    """Patch `SlurmdbdCharm._write_config_and_restart_slurmdbd` and return the mock."""
+    write_config = Mock()
+    monkeypatch.setattr("charm.SlurmdbdCharm._write_config_and_restart_slurmdbd", write_config)
+    return write_config
+
+
+class _RecordingProperty:
+    """Property stand-in that records the values set on it and whether it was deleted."""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.deleted = False
+
+    def __get__(self, instance, owner=None):
+        return self if instance is None else None
+
+    def __set__(self, instance, value) -> None:
+        self.calls.append(value)
+
+    def __delete__(self, instance) -> None:
+        self.deleted = True
+
+
+@pytest.fixture
+def mysql_unix_port(monkeypatch) -> _RecordingProperty:
+    """Patch the `SlurmdbdManager.mysql_unix_port` property and return the recorder."""
+    mysql_unix_port = _RecordingProperty()
+    monkeypatch.setattr(SlurmdbdManager, "mysql_unix_port", mysql_unix_port)
+    return mysql_unix_port
+
+
+def test_install_success(harness, slurmdbd) -> None:
+    """Test `InstallEvent` hook success."""
+    harness.set_leader(True)
+    harness.charm._slurmdbd = slurmdbd
+    harness.charm._stored.db_info = {"rats": "123"}
+    harness.charm.on.install.emit()
+
+    assert harness.charm.unit.status == ActiveStatus()
+    slurmdbd.munge.service.enable.assert_called_once()
+
+
+def test_install_fail_ha_support(harness, defer) -> None:
+    """Test `InstallEvent` hook failure when there are multiple slurmdbd units.
+
+    Notes:
+        The slurmdbd charm currently does not support high-availability so this
+        unit test validates that we properly handle if multiple slurmdbd units
+        are deployed.
+    """
+    harness.set_leader(False)
+    harness.charm.on.install.emit()
+
+    assert harness.charm.unit.status == BlockedStatus(
+        "slurmdbd high-availability not supported. see logs for further details"
     )
-    def test_on_database_created_tcp_endpoint(
-        self, mysql_unix_port, _write_config_and_restart_slurmdbd
-    ) -> None:
-        """Tests tcp endpoint for database."""
-        mysql_unix_port.__delete__ = Mock()
-        event = Mock()
-        event.endpoints = "10.2.5.20:1234"
-        event.username = "fake-user"
-        event.password = "fake-password"
-
-        self.harness.charm._on_database_created(event)
-
-        mysql_unix_port.__delete__.assert_called_once()
-        db_info = {
-            "StorageUser": "fake-user",
-            "StoragePass": "fake-password",
-            "StorageLoc": "slurm_acct_db",
-            "StorageHost": "10.2.5.20",
-            "StoragePort": "1234",
-        }
-        self.assertEqual(self.harness.charm._stored.db_info, db_info)
-        _write_config_and_restart_slurmdbd.assert_called_once_with(event)
-
-    @patch("charm.SlurmdbdCharm._write_config_and_restart_slurmdbd")
-    @patch(
-        "charms.hpc_libs.v0.slurm_ops.SlurmdbdManager.mysql_unix_port", new_callable=PropertyMock
+    defer.assert_called()
+
+
+def test_install_fail_slurmdbd_package(harness, defer) -> None:
+    """Test `InstallEvent` hook when slurmdbd fails to install."""
+    harness.set_leader(True)
+    harness.charm._slurmdbd.install = Mock(side_effect=SlurmOpsError("failed to install slurmd"))
+    harness.charm.on.install.emit()
+
+    assert harness.charm.unit.status == BlockedStatus(
+        "failed to install slurmdbd. see logs for further details"
     )
-    def test_on_database_created_multiple_tcp_endpoints(
-        self, mysql_unix_port, _write_config_and_restart_slurmdbd
-    ) -> None:
-        """Tests multiple tcp endpoints for the database."""
-        mysql_unix_port.__delete__ = Mock()
-        event = Mock()
-        # Note: odd spacing to test split logic as well
-        event.endpoints = "10.2.5.20:1234 ,10.2.5.21:1234, 10.2.5.21:1234"
-        event.username = "fake-user"
-        event.password = "fake-password"
-
-        self.harness.charm._on_database_created(event)
-
-        mysql_unix_port.__delete__.assert_called_once()
-        db_info = {
-            "StorageUser": "fake-user",
-            "StoragePass": "fake-password",
-            "StorageLoc": "slurm_acct_db",
-            "StorageHost": "10.2.5.20",
-            "StoragePort": "1234",
-        }
-        self.assertEqual(self.harness.charm._stored.db_info, db_info)
-        _write_config_and_restart_slurmdbd.assert_called_once_with(event)
-
-    @patch("charm.SlurmdbdCharm._write_config_and_restart_slurmdbd")
-    @patch(
-        "charms.hpc_libs.v0.slurm_ops.SlurmdbdManager.mysql_unix_port", new_callable=PropertyMock
+    defer.assert_called()
+
+
+def test_update_status_fail(harness) -> None:
+    """Test `UpdateStatusEvent` hook failure."""
+    harness.set_leader(True)
+    harness.charm.on.update_status.emit()
+
+    assert harness.charm.unit.status == BlockedStatus(
+        "failed to install slurmdbd. see logs for further details"
     )
-    def test_on_database_created_ipv6_tcp_endpoints(
-        self,
-        mysql_unix_port,
-        _write_config_and_restart_slurmdbd,
-        *_,
-    ) -> None:
-        """Tests multiple tcp endpoints for the database."""
-        mysql_unix_port.__delete__ = Mock()
-        event = Mock()
+
+
+def test_check_slurmdbd(harness, slurmdbd) -> None:
+    """Test that `BlockedStatus` is set when slurmdbd service is not running."""
+    slurmdbd.service.active.return_value = False
+    harness.charm._slurmdbd = slurmdbd
+    harness.charm._check_slurmdbd(max_attemps=1)
+
+    assert harness.charm.unit.status == BlockedStatus("cannot start slurmdbd")
+    slurmdbd.service.restart.assert_called_once()
+
+
+def test_on_database_created_no_endpoints(harness, db_event) -> None:
+    """Tests that the on_database_created method errors with no endpoints."""
+    harness.set_leader(True)
+    db_event.endpoints = None
+    with pytest.raises(ValueError):
+        harness.charm._on_database_created(db_event)
+    assert harness.charm.unit.status == BlockedStatus("No database endpoints provided")
+
+    db_event.endpoints = ""
+    with pytest.raises(ValueError):
+        harness.charm._on_database_created(db_event)
+    assert harness.charm.unit.status == BlockedStatus("No database endpoints provided")
+
+    db_event.endpoints = " , "
+    with pytest.raises(ValueError):
+        harness.charm._on_database_created(db_event)
+    assert harness.charm.unit.status == BlockedStatus("No database endpoints provided")
+
+
+@pytest.mark.parametrize(
+    "endpoints,unix_port,storage",
+    [
+        pytest.param("file:///path/to/some/socket", "/path/to/some/socket", {}, id="socket"),
+        # Note: also include some whitespace just to check.
+        pytest.param(
+            " file:///some/other/path, file:///path/to/some/socket ",
+            "/some/other/path",
+            {},
+            id="multiple-sockets",
+        ),
+        pytest.param(
+            "10.2.5.20:1234",
+            None,
+            {"StorageHost": "10.2.5.20", "StoragePort": "1234"},
+            id="tcp",
+        ),
         # Note: odd spacing to test split logic as well
-        event.endpoints = (
+        pytest.param(
+            "10.2.5.20:1234 ,10.2.5.21:1234, 10.2.5.21:1234",
+            None,
+            {"StorageHost": "10.2.5.20", "StoragePort": "1234"},
+            id="multiple-tcp",
+        ),
+        pytest.param(
             "[9ee0:49d9:465c:8fd4:c5ef:f596:73ef:0c4e]:1234 ,"
             "[e7d5:2c42:8074:8c51:d0ca:af6a:488e:f333]:1234, "
-            "[e923:bb41:3db3:1884:a97e:d16e:dc51:271e]:1234"
-        )
-        event.username = "fake-user"
-        event.password = "fake-password"
-
-        self.harness.charm._on_database_created(event)
-
-        mysql_unix_port.__delete__.assert_called_once()
-        db_info = {
-            "StorageUser": "fake-user",
-            "StoragePass": "fake-password",
-            "StorageLoc": "slurm_acct_db",
-            "StorageHost": "9ee0:49d9:465c:8fd4:c5ef:f596:73ef:0c4e",
-            "StoragePort": "1234",
-        }
-        self.assertEqual(self.harness.charm._stored.db_info, db_info)
-        _write_config_and_restart_slurmdbd.assert_called_once_with(event)
+            "[e923:bb41:3db3:1884:a97e:d16e:dc51:271e]:1234",
+            None,
+            {"StorageHost": "9ee0:49d9:465c:8fd4:c5ef:f596:73ef:0c4e", "StoragePort": "1234"},
+            id="multiple-ipv6-tcp",
+        ),
+    ],
+)
+def test_on_database_created(
+    harness, db_event, mysql_unix_port, write_config, endpoints, unix_port, storage
+) -> None:
+    """Tests that socket endpoints update the environment file and tcp endpoints slurmdbd.conf."""
+    db_event.endpoints = endpoints
+    harness.charm._on_database_created(db_event)
+
+    assert mysql_unix_port.calls == ([unix_port] if unix_port else [])
+    assert mysql_unix_port.deleted is (unix_port is None)
+    assert harness.charm._stored.db_info == _BASE_DB_INFO | storage
+    write_config.assert_called_once_with(db_event)
@@ -4,6 +4,7 @@
 
 """SlurmrestdCharm."""
 
+import functools
 import logging
 
 from interface_slurmctld import Slurmctld, SlurmctldAvailableEvent, SlurmctldUnavailableEvent
@@ -35,17 +36,23 @@ class SlurmrestdCharm(CharmBase):
 
         self._stored.set_default(slurm_installed=False)
 
-        self._slurmrestd = SlurmrestdManager(snap=False)
+        # The interface must be constructed on every hook so that its observers are
+        # registered before ops dispatches the event.
         self._slurmctld = Slurmctld(self, "slurmctld")
 
-        event_handler_bindings = {
-            self.on.install: self._on_install,
-            self.on.update_status: self._on_update_status,
-            self._slurmctld.on.slurmctld_available: self._on_slurmctld_available,
-            self._slurmctld.on.slurmctld_unavailable: self._on_slurmctld_unavailable,
-        }
-        for event, handler in event_handler_bindings.items():
-            self.framework.observe(event, handler)
+        self.framework.observe(self.on.install, self._on_install)
+        self.framework.observe(self.on.update_status, self._on_update_status)
+        self.framework.observe(
+            self._slurmctld.on.slurmctld_available, self._on_slurmctld_available
+        )
+        self.framework.observe(
+            self._slurmctld.on.slurmctld_unavailable, self._on_slurmctld_unavailable
+        )
+
+    @functools.cached_property
+    def _slurmrestd(self) -> SlurmrestdManager:
+        """Return the slurmrestd manager, constructed on first use."""
+        return SlurmrestdManager(snap=False)
 
     def _on_install(self, event: InstallEvent) -> None:
         """Perform installation operations for slurmrestd."""
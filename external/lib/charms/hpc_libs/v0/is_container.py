@@ -40,8 +40,11 @@ class ApplicationCharm(CharmBase):
 ```
 """
 
+import functools
 import shutil
 import subprocess
+from pathlib import Path
+from typing import Optional
 
 # The unique Charmhub library identifier, never change it
 LIBID = "eb95ad73da1941c0af186ee670f96507"
@@ -63,12 +66,51 @@ class UnknownVirtStateError(Exception):
         return self.args[0]
 
 
+def _container_from_environment() -> Optional[bool]:
+    """Detect a container runtime from the markers that container managers leave behind.
+
+    Returns `True` if a marker is found, otherwise `None`. The absence of a marker is
+    not proof that the machine is not a container, so the caller must fall back
+    to `systemd-detect-virt`.
+    """
+    # systemd, when running as PID 1, writes the detected container type here.
+    try:
+        if Path("/run/systemd/container").read_text().strip() not in ("", "none"):
+            return True
+    except OSError:
+        pass
+
+    # Container managers such as LXD pass `container=<type>` in the environment of PID 1.
+    try:
+        environ = Path("/proc/1/environ").read_bytes()
+        if any(var.startswith(b"container=") for var in environ.split(b"\0")):
+            return True
+    except OSError:
+        pass
+
+    # Docker and podman don't set `container=` for PID 1, but leave these files behind.
+    if any(
+        Path(marker).exists()
+        for marker in ("/.dockerenv", "/run/.containerenv", "/run/host/container-manager")
+    ):
+        return True
+
+    return None
+
+
+@functools.lru_cache(maxsize=1)
 def is_container() -> bool:
     """Detect if the machine is a container instance.
 
+    The virtualization runtime cannot change while the charm is running, so the
+    result is cached after the first successful call.
+
     Raises:
         DetectVirtNotFoundError: Raised if `systemd-detect-virt` is not found on machine.
     """
+    if (result := _container_from_environment()) is not None:
+        return result
+
     if shutil.which("systemd-detect-virt") is None:
         raise UnknownVirtStateError(
             (
@@ -77,5 +119,10 @@ def is_container() -> bool:
             )
         )
 
-    result = subprocess.run(["systemd-detect-virt", "--container"])
+    result = subprocess.run(
+        ["systemd-detect-virt", "--container"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
     return result.returncode == 0
@@ -59,14 +59,17 @@ __all__ = [
     "SlurmrestdManager",
 ]
 
+import base64
+import functools
+import grp
 import logging
 import os
-import shutil
+import pwd
+import secrets
 import socket
 import subprocess
-import textwrap
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Iterable, Mapping
 from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
@@ -74,9 +77,7 @@ from typing import Any, Optional, Union
 
 import distro
 import dotenv
-import yaml
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+import dotenv.parser
 from slurmutils.editors import (
     acctgatherconfig,
     cgroupconfig,
@@ -113,8 +114,6 @@ LIBPATCH = 12
 
 # Charm library dependencies to fetch during `charmcraft pack`.
 PYDEPS = [
-    "cryptography~=44.0.0",
-    "pyyaml>=6.0.2",
     "python-dotenv~=1.0.1",
     "slurmutils<1.0.0,>=0.11.0",
     "distro~=1.9.0",
@@ -122,6 +121,94 @@ PYDEPS = [
 
 _logger = logging.getLogger(__name__)
 
+_UBUNTU_HPC_PPA_KEY = """
+-----BEGIN PGP PUBLIC KEY BLOCK-----
+Comment: Hostname:
+Version: Hockeypuck 2.2
+
+xsFNBGTuZb8BEACtJ1CnZe6/hv84DceHv+a54y3Pqq0gqED0xhTKnbj/E2ByJpmT
+NlDNkpeITwPAAN1e3824Me76Qn31RkogTMoPJ2o2XfG253RXd67MPxYhfKTJcnM3
+CEkmeI4u2Lynh3O6RQ08nAFS2AGTeFVFH2GPNWrfOsGZW03Jas85TZ0k7LXVHiBs
+W6qonbsFJhshvwC3SryG4XYT+z/+35x5fus4rPtMrrEOD65hij7EtQNaE8owuAju
+Kcd0m2b+crMXNcllWFWmYMV0VjksQvYD7jwGrWeKs+EeHgU8ZuqaIP4pYHvoQjag
+umqnH9Qsaq5NAXiuAIAGDIIV4RdAfQIR4opGaVgIFJdvoSwYe3oh2JlrLPBlyxyY
+dayDifd3X8jxq6/oAuyH1h5K/QLs46jLSR8fUbG98SCHlRmvozTuWGk+e07ALtGe
+sGv78ToHKwoM2buXaTTHMwYwu7Rx8LZ4bZPHdersN1VW/m9yn1n5hMzwbFKy2s6/
+D4Q2ZBsqlN+5aW2q0IUmO+m0GhcdaDv8U7RVto1cWWPr50HhiCi7Yvei1qZiD9jq
+57oYZVqTUNCTPxi6NeTOdEc+YqNynWNArx4PHh38LT0bqKtlZCGHNfoAJLPVYhbB
+b2AHj9edYtHU9AAFSIy+HstET6P0UDxy02IeyE2yxoUBqdlXyv6FL44E+wARAQAB
+zRxMYXVuY2hwYWQgUFBBIGZvciBVYnVudHUgSFBDwsGOBBMBCgA4FiEErocSHcPk
+oLD4H/Aj9tDF1ca+s3sFAmTuZb8CGwMFCwkIBwIGFQoJCAsCBBYCAwECHgECF4AA
+CgkQ9tDF1ca+s3sz3w//RNawsgydrutcbKf0yphDhzWS53wgfrs2KF1KgB0u/H+u
+6Kn2C6jrVM0vuY4NKpbEPCduOj21pTCepL6PoCLv++tICOLVok5wY7Zn3WQFq0js
+Iy1wO5t3kA1cTD/05v/qQVBGZ2j4DsJo33iMcQS5AjHvSr0nu7XSvDDEE3cQE55D
+87vL7lgGjuTOikPh5FpCoS1gpemBfwm2Lbm4P8vGOA4/witRjGgfC1fv1idUnZLM
+TbGrDlhVie8pX2kgB6yTYbJ3P3kpC1ZPpXSRWO/cQ8xoYpLBTXOOtqwZZUnxyzHh
+gM+hv42vPTOnCo+apD97/VArsp59pDqEVoAtMTk72fdBqR+BB77g2hBkKESgQIEq
+EiE1/TOISioMkE0AuUdaJ2ebyQXugSHHuBaqbEC47v8t5DVN5Qr9OriuzCuSDNFn
+6SBHpahN9ZNi9w0A/Yh1+lFfpkVw2t04Q2LNuupqOpW+h3/62AeUqjUIAIrmfeML
+IDRE2VdquYdIXKuhNvfpJYGdyvx/wAbiAeBWg0uPSepwTfTG59VPQmj0FtalkMnN
+ya2212K5q68O5eXOfCnGeMvqIXxqzpdukxSZnLkgk40uFJnJVESd/CxHquqHPUDE
+fy6i2AnB3kUI27D4HY2YSlXLSRbjiSxTfVwNCzDsIh7Czefsm6ITK2+cVWs0hNQ=
+=cs1s
+-----END PGP PUBLIC KEY BLOCK-----
+"""
+# Same file name that `apt.import_key` derives from the key fingerprint.
+_UBUNTU_HPC_PPA_KEYRING = Path(
+    "/etc/apt/trusted.gpg.d/AE87121DC3E4A0B0F81FF023F6D0C5D5C6BEB37B.gpg"
+)
+
+_ULIMIT_CONFIG = """
+* soft nofile  1048576
+* hard nofile  1048576
+* soft memlock unlimited
+* hard memlock unlimited
+* soft stack unlimited
+* hard stack unlimited
+"""
+
+_SACKD_CONFIG_SERVER_OVERRIDE = """
+[Service]
+ExecStart=
+ExecStart=/usr/sbin/sackd --systemd --conf-server $SACKD_CONFIG_SERVER
+"""
+
+_NOFILE_OVERRIDE = """
+[Service]
+LimitMEMLOCK=infinity
+LimitNOFILE=1048576
+"""
+
+_SLURMD_CONFIG_SERVER_OVERRIDE = """
+[Service]
+ExecStart=
+ExecStart=/usr/bin/sh -c "/usr/sbin/slurmd -D -s $${SLURMD_CONFIG_SERVER:+--conf-server $$SLURMD_CONFIG_SERVER} $$SLURMD_OPTIONS"
+"""
+
+_SLURMRESTD_SERVICE = """
+[Unit]
+Description=Slurm REST daemon
+After=network.target munge.service slurmctld.service
+ConditionPathExists=/etc/slurm/slurm.conf
+Documentation=man:slurmrestd(8)
+
+[Service]
+Type=simple
+EnvironmentFile=-/etc/default/slurmrestd
+Environment="SLURM_JWT=daemon"
+ExecStart=/usr/sbin/slurmrestd $SLURMRESTD_OPTIONS -vv 0.0.0.0:6820
+ExecReload=/bin/kill -HUP $MAINPID
+User=slurmrestd
+Group=slurmrestd
+
+# Restart service if failed
+Restart=on-failure
+RestartSec=30s
+
+[Install]
+WantedBy=multi-user.target
+"""
+
 
 class SlurmOpsError(Exception):
     """Exception raised when a slurm operation failed."""
@@ -160,6 +247,34 @@ def _call(
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _get_ids(user: str, group: str) -> tuple[int, int]:
+    """Resolve the numeric uid and gid of `user` and `group`.
+
+    Lookups can go over the network with LDAP or SSSD, so each pair is resolved once.
+
+    Raises:
+        KeyError: Raised if the user or group does not exist.
+    """
+    return pwd.getpwnam(user).pw_uid, grp.getgrnam(group).gr_gid
+
+
+def _dearmor(key: str) -> bytes:
+    """Decode an ASCII armored GPG key into its binary form.
+
+    This is equivalent to `gpg --dearmor` for a single armored block.
+    """
+    # Armor headers end at the first blank line, and the `=XXXX` checksum follows the body.
+    body = key.strip().split("\n\n", 1)[1].rsplit("\n=", 1)[0]
+    return base64.b64decode("".join(body.split()))
+
+
+@functools.lru_cache(maxsize=1)
+def _short_hostname() -> str:
+    """Get the hostname of this machine without its domain."""
+    return socket.gethostname().split(".")[0]
+
+
 def _snap(*args) -> str:
     """Control snap by via executed `snap ...` commands.
 
@@ -178,15 +293,6 @@ def _systemctl(*args) -> str:
     return _call("systemctl", *args).stdout
 
 
-def _mungectl(*args, stdin: Optional[str] = None) -> str:
-    """Control munge via `mungectl ...` commands.
-
-    Raises:
-        SlurmOpsError: Raised if mungectl command fails.
-    """
-    return _call("mungectl", *args, stdin=stdin).stdout
-
-
 class _ServiceType(Enum):
     """Type of Slurm service to manage."""
 
@@ -222,12 +328,66 @@ class _EnvManager:
 
     def set(self, config: Mapping[str, Any]) -> None:
         """Set environment variable for service."""
-        for key, value in config.items():
-            dotenv.set_key(self._file, key.upper(), str(value))
+        self.update(config)
 
     def unset(self, key: str) -> None:
         """Unset environment variable for service."""
-        dotenv.unset_key(self._file, key.upper())
+        self.update(remove=[key])
+
+    def update(
+        self, config: Optional[Mapping[str, Any]] = None, remove: Iterable[str] = ()
+    ) -> None:
+        """Set and unset environment variables for service with a single file rewrite.
+
+        Lines for variables that are not being changed, including comments, are preserved.
+        Every occurrence of a variable is rewritten, as both dotenv and systemd use the last
+        occurrence. New values are single-quoted the same way `dotenv.set_key` quotes them.
+
+        The new file is written next to the current one and moved into place, so
+        the environment file is never left partially written.
+        """
+        config = {key.upper(): str(value) for key, value in (config or {}).items()}
+        remove = {key.upper() for key in remove}
+
+        lines = []
+        written = set()
+        if self._file.exists():
+            with self._file.open() as f:
+                for binding in dotenv.parser.parse_stream(f):
+                    if binding.key in remove:
+                        continue
+                    if binding.key in config:
+                        lines.append(self._format(binding.key, config[binding.key]))
+                        written.add(binding.key)
+                    else:
+                        lines.append(binding.original.string)
+        elif not config:
+            return
+
+        new = [(key, value) for key, value in config.items() if key not in written]
+        if new and lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+        lines.extend(self._format(key, value) for key, value in new)
+        self._write("".join(lines))
+
+    def _write(self, content: str) -> None:
+        """Atomically replace the environment file, keeping its mode and owner."""
+        tmp = self._file.with_name(f".{self._file.name}.tmp")
+        tmp.write_text(content)
+        try:
+            stat = self._file.stat()
+        except FileNotFoundError:
+            tmp.chmod(0o644)
+        else:
+            tmp.chmod(stat.st_mode & 0o7777)
+            os.chown(tmp, stat.st_uid, stat.st_gid)
+        os.replace(tmp, self._file)
+
+    @staticmethod
+    def _format(key: str, value: str) -> str:
+        """Format an environment variable as a line of the environment file."""
+        value = value.replace("'", "\\'")
+        return f"{key}='{value}'\n"
 
 
 class _ConfigManager(ABC):
@@ -256,6 +416,25 @@ class _ConfigManager(ABC):
     def edit(self):
         """Edit the current configuration file."""
 
+    @contextmanager
+    def _edit(self, editor, mode: int):
+        """Edit the configuration file with `editor`, only writing it back if it changed."""
+        if not os.path.exists(self._config_path):
+            with editor.edit(
+                self._config_path, mode=mode, user=self._user, group=self._group
+            ) as config:
+                yield config
+            return
+
+        config = editor.load(self._config_path)
+        original = editor.dumps(config)
+        yield config
+        if editor.dumps(config) == original:
+            _logger.debug("%s is unchanged. skipping rewrite", self._config_path)
+            return
+
+        editor.dump(config, self._config_path, mode=mode, user=self._user, group=self._group)
+
 
 class _AcctGatherConfigManager(_ConfigManager):
     """Manage the `acct_gather.conf` configuration file."""
@@ -273,9 +452,7 @@ class _AcctGatherConfigManager(_ConfigManager):
     @contextmanager
     def edit(self) -> AcctGatherConfig:
         """Edit the current `acct_gather.conf` configuration file."""
-        with acctgatherconfig.edit(
-            self._config_path, mode=0o600, user=self._user, group=self._group
-        ) as config:
+        with self._edit(acctgatherconfig, 0o600) as config:
             yield config
 
 
@@ -295,9 +472,7 @@ class _CgroupConfigManager(_ConfigManager):
     @contextmanager
     def edit(self) -> CgroupConfig:
         """Edit the current `cgroup.conf` configuration file."""
-        with cgroupconfig.edit(
-            self._config_path, mode=0o644, user=self._user, group=self._group
-        ) as config:
+        with self._edit(cgroupconfig, 0o644) as config:
             yield config
 
 
@@ -315,9 +490,7 @@ class _GRESConfigManager(_ConfigManager):
     @contextmanager
     def edit(self) -> GRESConfig:
         """Edit the current `gres.conf` configuration file."""
-        with gresconfig.edit(
-            self._config_path, mode=0o644, user=self._user, group=self._group
-        ) as config:
+        with self._edit(gresconfig, 0o644) as config:
             yield config
 
 
@@ -335,9 +508,7 @@ class _SlurmConfigManager(_ConfigManager):
     @contextmanager
     def edit(self) -> SlurmConfig:
         """Edit the current `slurm.conf` configuration file."""
-        with slurmconfig.edit(
-            self._config_path, mode=0o644, user=self._user, group=self._group
-        ) as config:
+        with self._edit(slurmconfig, 0o644) as config:
             yield config
 
 
@@ -357,9 +528,7 @@ class _SlurmdbdConfigManager(_ConfigManager):
     @contextmanager
     def edit(self) -> SlurmdbdConfig:
         """Edit the current `slurmdbd.conf` configuration file."""
-        with slurmdbdconfig.edit(
-            self._config_path, mode=0o600, user=self._user, group=self._group
-        ) as config:
+        with self._edit(slurmdbdconfig, 0o600) as config:
             yield config
 
 
@@ -435,14 +604,13 @@ class _SnapServiceManager(_ServiceManager):
 
     def active(self) -> bool:
         """Return True if the service is active."""
-        info = yaml.safe_load(_snap("info", "slurm"))
-        if (services := info.get("services")) is None:
+        # `snap services` prints a `Service Startup Current Notes` header followed by a row
+        # for the service, which is far cheaper to produce and parse than `snap info`.
+        rows = (_snap("services", f"slurm.{self._service.value}") or "").splitlines()[1:]
+        if not rows:
             raise SlurmOpsError("unable to retrive snap info. ensure slurm is correctly installed")
 
-        # Assume `services` contains the service, since `ServiceManager` is not exposed as a
-        # public interface for now.
-        # We don't do `"active" in state` because the word "active" is also part of "inactive" :)
-        return "inactive" not in services[f"slurm.{self._service.value}"]
+        return rows[0].split()[2] != "inactive"
 
 
 class _OpsManager(ABC):
@@ -466,6 +634,11 @@ class _OpsManager(ABC):
     def var_lib_path(self) -> Path:
         """Get the path to the Slurm variable state data directory."""
 
+    @property
+    @abstractmethod
+    def mungectl_path(self) -> str:
+        """Get the path to the `mungectl` executable."""
+
     @abstractmethod
     def service_manager_for(self, service: _ServiceType) -> _ServiceManager:
         """Return the `ServiceManager` for the specified `ServiceType`."""
@@ -483,20 +656,16 @@ class _SnapManager(_OpsManager):
         # TODO: https://github.com/charmed-hpc/hpc-libs/issues/35 -
         #   Pin Slurm snap to stable channel.
         _snap("install", "slurm", "--channel", "latest/candidate", "--classic")
-        # TODO: https://github.com/charmed-hpc/slurm-snap/issues/49 -
-        #   Request automatic alias for the Slurm snap so we don't need to do it here.
-        #   We will possibly need to account for a third-party Slurm snap installation
-        #   where aliasing is not automatically performed.
-        _snap("alias", "slurm.mungectl", "mungectl")
 
     def version(self) -> str:
         """Get the current version of the `slurm` snap installed on the system."""
-        info = yaml.safe_load(_snap("info", "slurm"))
-        if (ver := info.get("installed")) is None:
+        # `snap list` prints a `Name Version Rev ...` header followed by a row for the snap.
+        rows = (_snap("list", "slurm") or "").splitlines()[1:]
+        if not rows:
             raise SlurmOpsError(
                 "unable to retrieve snap info. ensure slurm is correctly installed"
             )
-        return ver.split(maxsplit=1)[0]
+        return rows[0].split()[1]
 
     @property
     def etc_path(self) -> Path:
@@ -508,6 +677,12 @@ class _SnapManager(_OpsManager):
         """Get the path to the Slurm variable state data directory."""
         return Path("/var/snap/slurm/common/var/lib/slurm")
 
+    @property
+    def mungectl_path(self) -> str:
+        """Get the path to the `mungectl` executable."""
+        # Call the snap app directly rather than aliasing it to `mungectl` on install.
+        return "/snap/bin/slurm.mungectl"
+
     def service_manager_for(self, service: _ServiceType) -> _ServiceManager:
         """Return the `ServiceManager` for the specified `ServiceType`."""
         return _SnapServiceManager(service)
@@ -529,9 +704,11 @@ class _AptManager(_OpsManager):
     def __init__(self, service: _ServiceType) -> None:
         self._service_name = service.value
         self._env_file = Path(f"/etc/default/{self._service_name}")
+        self._version: Optional[str] = None
 
     def install(self) -> None:
         """Install Slurm using the `slurm-wlm` Debian package set."""
+        self._version = None
         self._init_ubuntu_hpc_ppa()
         self._install_service()
         self._create_state_save_location()
@@ -539,10 +716,17 @@ class _AptManager(_OpsManager):
 
     def version(self) -> str:
         """Get the current version of Slurm installed on the system."""
-        try:
-            return apt.DebianPackage.from_installed_package(self._service_name).version.number
-        except apt.PackageNotFoundError as e:
-            raise SlurmOpsError(f"unable to retrieve {self._service_name} version. reason: {e}")
+        # Reading the dpkg database is slow, and the version only changes on `install`.
+        if self._version is None:
+            try:
+                package = apt.DebianPackage.from_installed_package(self._service_name)
+            except apt.PackageNotFoundError as e:
+                raise SlurmOpsError(
+                    f"unable to retrieve {self._service_name} version. reason: {e}"
+                )
+            self._version = package.version.number
+
+        return self._version
 
     @property
     def etc_path(self) -> Path:
@@ -554,6 +738,12 @@ class _AptManager(_OpsManager):
         """Get the path to the Slurm variable state data directory."""
         return Path("/var/lib/slurm")
 
+    @property
+    def mungectl_path(self) -> str:
+        """Get the path to the `mungectl` executable."""
+        # The `mungectl` Debian package installs into `PATH`.
+        return "mungectl"
+
     def service_manager_for(self, service: _ServiceType) -> _ServiceManager:
         """Return the `ServiceManager` for the specified `ServiceType`."""
         return _SystemctlServiceManager(service)
@@ -577,43 +767,26 @@ class _AptManager(_OpsManager):
             release=distro.codename(),
             groups=["main"],
         )
-        experimental.import_key(
-            textwrap.dedent(
-                """
-                -----BEGIN PGP PUBLIC KEY BLOCK-----
-                Comment: Hostname:
-                Version: Hockeypuck 2.2
-
-                xsFNBGTuZb8BEACtJ1CnZe6/hv84DceHv+a54y3Pqq0gqED0xhTKnbj/E2ByJpmT
-                NlDNkpeITwPAAN1e3824Me76Qn31RkogTMoPJ2o2XfG253RXd67MPxYhfKTJcnM3
-                CEkmeI4u2Lynh3O6RQ08nAFS2AGTeFVFH2GPNWrfOsGZW03Jas85TZ0k7LXVHiBs
-                W6qonbsFJhshvwC3SryG4XYT+z/+35x5fus4rPtMrrEOD65hij7EtQNaE8owuAju
-                Kcd0m2b+crMXNcllWFWmYMV0VjksQvYD7jwGrWeKs+EeHgU8ZuqaIP4pYHvoQjag
-                umqnH9Qsaq5NAXiuAIAGDIIV4RdAfQIR4opGaVgIFJdvoSwYe3oh2JlrLPBlyxyY
-                dayDifd3X8jxq6/oAuyH1h5K/QLs46jLSR8fUbG98SCHlRmvozTuWGk+e07ALtGe
-                sGv78ToHKwoM2buXaTTHMwYwu7Rx8LZ4bZPHdersN1VW/m9yn1n5hMzwbFKy2s6/
-                D4Q2ZBsqlN+5aW2q0IUmO+m0GhcdaDv8U7RVto1cWWPr50HhiCi7Yvei1qZiD9jq
-                57oYZVqTUNCTPxi6NeTOdEc+YqNynWNArx4PHh38LT0bqKtlZCGHNfoAJLPVYhbB
-                b2AHj9edYtHU9AAFSIy+HstET6P0UDxy02IeyE2yxoUBqdlXyv6FL44E+wARAQAB
-                zRxMYXVuY2hwYWQgUFBBIGZvciBVYnVudHUgSFBDwsGOBBMBCgA4FiEErocSHcPk
-                oLD4H/Aj9tDF1ca+s3sFAmTuZb8CGwMFCwkIBwIGFQoJCAsCBBYCAwECHgECF4AA
-                CgkQ9tDF1ca+s3sz3w//RNawsgydrutcbKf0yphDhzWS53wgfrs2KF1KgB0u/H+u
-                6Kn2C6jrVM0vuY4NKpbEPCduOj21pTCepL6PoCLv++tICOLVok5wY7Zn3WQFq0js
-                Iy1wO5t3kA1cTD/05v/qQVBGZ2j4DsJo33iMcQS5AjHvSr0nu7XSvDDEE3cQE55D
-                87vL7lgGjuTOikPh5FpCoS1gpemBfwm2Lbm4P8vGOA4/witRjGgfC1fv1idUnZLM
-                TbGrDlhVie8pX2kgB6yTYbJ3P3kpC1ZPpXSRWO/cQ8xoYpLBTXOOtqwZZUnxyzHh
-                gM+hv42vPTOnCo+apD97/VArsp59pDqEVoAtMTk72fdBqR+BB77g2hBkKESgQIEq
-                EiE1/TOISioMkE0AuUdaJ2ebyQXugSHHuBaqbEC47v8t5DVN5Qr9OriuzCuSDNFn
-                6SBHpahN9ZNi9w0A/Yh1+lFfpkVw2t04Q2LNuupqOpW+h3/62AeUqjUIAIrmfeML
-                IDRE2VdquYdIXKuhNvfpJYGdyvx/wAbiAeBWg0uPSepwTfTG59VPQmj0FtalkMnN
-                ya2212K5q68O5eXOfCnGeMvqIXxqzpdukxSZnLkgk40uFJnJVESd/CxHquqHPUDE
-                fy6i2AnB3kUI27D4HY2YSlXLSRbjiSxTfVwNCzDsIh7Czefsm6ITK2+cVWs0hNQ=
-                =cs1s
-                -----END PGP PUBLIC KEY BLOCK-----
-                """
-            )
-        )
+
+        # Skip re-adding the repository and refreshing every package index if a previous
+        # install already enabled the repository and the package lists were refreshed since.
         repositories = apt.RepositoryMapping()
+        stamp = Path("/var/lib/apt/periodic/update-success-stamp")
+        for repo in repositories:
+            if (
+                repo.enabled
+                and repo.uri.rstrip("/") == experimental.uri
+                and repo.release == experimental.release
+                and stamp.exists()
+                and stamp.stat().st_mtime > Path(repo.filename).stat().st_mtime
+            ):
+                _logger.debug("ubuntu hpc repositories already enabled. skipping apt update")
+                return
+
+        # Write the keyring directly instead of shelling out to `gpg` through `apt.import_key`.
+        keyring = _dearmor(_UBUNTU_HPC_PPA_KEY)
+        if not _UBUNTU_HPC_PPA_KEYRING.exists() or _UBUNTU_HPC_PPA_KEYRING.read_bytes() != keyring:
+            _UBUNTU_HPC_PPA_KEYRING.write_bytes(keyring)
         repositories.add(experimental)
 
         try:
@@ -627,18 +800,12 @@ class _AptManager(_OpsManager):
     def _set_ulimit() -> None:
         """Set `ulimit` on nodes that need to be able to open many files at once."""
         ulimit_config_file = Path("/etc/security/limits.d/20-charmed-hpc-openfile.conf")
-        ulimit_config = textwrap.dedent(
-            """
-            * soft nofile  1048576
-            * hard nofile  1048576
-            * soft memlock unlimited
-            * hard memlock unlimited
-            * soft stack unlimited
-            * hard stack unlimited
-            """
-        )
-        _logger.debug("setting ulimit configuration for node to:\n%s", ulimit_config)
-        ulimit_config_file.write_text(ulimit_config)
+        if ulimit_config_file.exists() and ulimit_config_file.read_text() == _ULIMIT_CONFIG:
+            _logger.debug("ulimit configuration for node is already up to date")
+            return
+
+        _logger.debug("setting ulimit configuration for node to:\n%s", _ULIMIT_CONFIG)
+        ulimit_config_file.write_text(_ULIMIT_CONFIG)
         ulimit_config_file.chmod(0o644)
 
     def _install_service(self) -> None:
@@ -682,26 +849,29 @@ class _AptManager(_OpsManager):
         target = self.var_lib_path / "checkpoint"
         target.mkdir(mode=0o755, parents=True, exist_ok=True)
         self.var_lib_path.chmod(0o755)
-        shutil.chown(self.var_lib_path, "slurm", "slurm")
-        shutil.chown(target, "slurm", "slurm")
+        uid, gid = _get_ids("slurm", "slurm")
+        os.chown(self.var_lib_path, uid, gid)
+        os.chown(target, uid, gid)
+
+    @staticmethod
+    def _write_unit_file(path: Path, content: str) -> bool:
+        """Write a systemd unit file or drop-in, returning True if its contents changed."""
+        if path.exists() and path.read_text() == content:
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return True
 
     def _apply_overrides(self) -> None:
         """Override defaults supplied provided by Slurm Debian packages."""
+        changed = False
         match self._service_name:
             case "sackd":
                 _logger.debug("overriding default sackd service configuration")
-                config_override = Path(
-                    "/etc/systemd/system/sackd.service.d/10-sackd-config-server.conf"
-                )
-                config_override.parent.mkdir(parents=True, exist_ok=True)
-                config_override.write_text(
-                    textwrap.dedent(
-                        """
-                        [Service]
-                        ExecStart=
-                        ExecStart=/usr/sbin/sackd --systemd --conf-server $SACKD_CONFIG_SERVER
-                        """
-                    )
+                changed |= self._write_unit_file(
+                    Path("/etc/systemd/system/sackd.service.d/10-sackd-config-server.conf"),
+                    _SACKD_CONFIG_SERVER_OVERRIDE,
                 )
 
                 # TODO: https://github.com/charmed-hpc/hpc-libs/issues/54 -
@@ -713,49 +883,21 @@ class _AptManager(_OpsManager):
                 _logger.debug("overriding default slurmctld service configuration")
                 self._set_ulimit()
 
-                nofile_override = Path(
-                    "/etc/systemd/system/slurmctld.service.d/10-slurmctld-nofile.conf"
-                )
-                nofile_override.parent.mkdir(exist_ok=True, parents=True)
-                nofile_override.write_text(
-                    textwrap.dedent(
-                        """
-                        [Service]
-                        LimitMEMLOCK=infinity
-                        LimitNOFILE=1048576
-                        """
-                    )
+                changed |= self._write_unit_file(
+                    Path("/etc/systemd/system/slurmctld.service.d/10-slurmctld-nofile.conf"),
+                    _NOFILE_OVERRIDE,
                 )
             case "slurmd":
                 _logger.debug("overriding default slurmd service configuration")
                 self._set_ulimit()
 
-                nofile_override = Path(
-                    "/etc/systemd/system/slurmctld.service.d/10-slurmd-nofile.conf"
+                changed |= self._write_unit_file(
+                    Path("/etc/systemd/system/slurmd.service.d/10-slurmd-nofile.conf"),
+                    _NOFILE_OVERRIDE,
                 )
-                nofile_override.parent.mkdir(exist_ok=True, parents=True)
-                nofile_override.write_text(
-                    textwrap.dedent(
-                        """
-                        [Service]
-                        LimitMEMLOCK=infinity
-                        LimitNOFILE=1048576
-                        """
-                    )
-                )
-
-                config_override = Path(
-                    "/etc/systemd/system/slurmd.service.d/20-slurmd-config-server.conf"
-                )
-                config_override.parent.mkdir(exist_ok=True, parents=True)
-                config_override.write_text(
-                    textwrap.dedent(
-                        """
-                        [Service]
-                        ExecStart=
-                        ExecStart=/usr/bin/sh -c "/usr/sbin/slurmd -D -s $${SLURMD_CONFIG_SERVER:+--conf-server $$SLURMD_CONFIG_SERVER} $$SLURMD_OPTIONS"
-                        """
-                    )
+                changed |= self._write_unit_file(
+                    Path("/etc/systemd/system/slurmd.service.d/20-slurmd-config-server.conf"),
+                    _SLURMD_CONFIG_SERVER_OVERRIDE,
                 )
             case "slurmrestd":
                 # TODO: https://github.com/charmed-hpc/hpc-libs/issues/39 -
@@ -792,38 +934,15 @@ class _AptManager(_OpsManager):
                 Path("/etc/default/slurmrestd").touch(mode=0o644)
 
                 _logger.debug("overriding default slurmrestd service configuration")
-                config_override = Path("/usr/lib/systemd/system/slurmrestd.service")
-                config_override.write_text(
-                    textwrap.dedent(
-                        """
-                        [Unit]
-                        Description=Slurm REST daemon
-                        After=network.target munge.service slurmctld.service
-                        ConditionPathExists=/etc/slurm/slurm.conf
-                        Documentation=man:slurmrestd(8)
-
-                        [Service]
-                        Type=simple
-                        EnvironmentFile=-/etc/default/slurmrestd
-                        Environment="SLURM_JWT=daemon"
-                        ExecStart=/usr/sbin/slurmrestd $SLURMRESTD_OPTIONS -vv 0.0.0.0:6820
-                        ExecReload=/bin/kill -HUP $MAINPID
-                        User=slurmrestd
-                        Group=slurmrestd
-
-                        # Restart service if failed
-                        Restart=on-failure
-                        RestartSec=30s
-
-                        [Install]
-                        WantedBy=multi-user.target
-                        """
-                    )
+                changed |= self._write_unit_file(
+                    Path("/usr/lib/systemd/system/slurmrestd.service"), _SLURMRESTD_SERVICE
                 )
             case _:
                 _logger.debug("'%s' does not require any overrides", self._service_name)
 
-        _systemctl("daemon-reload")
+        # Package installs reload systemd themselves, so only reload for our own unit changes.
+        if changed:
+            _systemctl("daemon-reload")
 
 
 # TODO: https://github.com/charmed-hpc/hpc-libs/issues/36 -
@@ -848,18 +967,12 @@ class _JWTKeyManager:
         """Set a new jwt key."""
         self._keyfile.write_text(key)
         self._keyfile.chmod(0o600)
-        shutil.chown(self._keyfile, self._user, self._group)
+        os.chown(self._keyfile, *_get_ids(self._user, self._group))
 
     def generate(self) -> None:
         """Generate a new, cryptographically secure jwt key."""
-        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-        self.set(
-            key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.TraditionalOpenSSL,
-                encryption_algorithm=serialization.NoEncryption(),
-            ).decode()
-        )
+        # `auth/jwt` signs tokens with HS256, so the key is a shared HMAC secret.
+        self.set(base64.b64encode(secrets.token_bytes(32)).decode())
 
 
 # TODO: https://github.com/charmed-hpc/mungectl/issues/5 -
@@ -867,28 +980,36 @@ class _JWTKeyManager:
 class _MungeKeyManager:
     """Control the munge key via `mungectl ...` commands."""
 
-    @staticmethod
-    def get() -> str:
+    def __init__(self, ops_manager: _OpsManager) -> None:
+        self._mungectl = ops_manager.mungectl_path
+
+    def _call(self, *args, stdin: Optional[str] = None) -> str:
+        """Control munge via `mungectl ...` commands.
+
+        Raises:
+            SlurmOpsError: Raised if mungectl command fails.
+        """
+        return _call(self._mungectl, *args, stdin=stdin).stdout
+
+    def get(self) -> str:
         """Get the current munge key.
 
         Returns:
             The current munge key as a base64-encoded string.
         """
-        return _mungectl("key", "get")
+        return self._call("key", "get")
 
-    @staticmethod
-    def set(key: str) -> None:
+    def set(self, key: str) -> None:
         """Set a new munge key.
 
         Args:
             key: A new, base64-encoded munge key.
         """
-        _mungectl("key", "set", stdin=key)
+        self._call("key", "set", stdin=key)
 
-    @staticmethod
-    def generate() -> None:
+    def generate(self) -> None:
         """Generate a new, cryptographically secure munge key."""
-        _mungectl("key", "generate")
+        self._call("key", "generate")
 
 
 class _MungeManager:
@@ -896,7 +1017,7 @@ class _MungeManager:
 
     def __init__(self, ops_manager: _OpsManager) -> None:
         self.service = ops_manager.service_manager_for(_ServiceType.MUNGE)
-        self.key = _MungeKeyManager()
+        self.key = _MungeKeyManager(ops_manager)
 
 
 class _PrometheusExporterManager:
@@ -912,12 +1033,24 @@ class _SlurmManagerBase:
     def __init__(self, service: _ServiceType, snap: bool = False) -> None:
         self._ops_manager = _SnapManager() if snap else _AptManager(service)
         self.service = self._ops_manager.service_manager_for(service)
-        self.munge = _MungeManager(self._ops_manager)
-        self.jwt = _JWTKeyManager(self._ops_manager, self.user, self.group)
-        self.exporter = _PrometheusExporterManager(self._ops_manager)
         self.install = self._ops_manager.install
         self.version = self._ops_manager.version
 
+    @functools.cached_property
+    def munge(self) -> _MungeManager:
+        """Get the manager for the `munged` service and munge key."""
+        return _MungeManager(self._ops_manager)
+
+    @functools.cached_property
+    def jwt(self) -> _JWTKeyManager:
+        """Get the manager for the jwt signing key."""
+        return _JWTKeyManager(self._ops_manager, self.user, self.group)
+
+    @functools.cached_property
+    def exporter(self) -> _PrometheusExporterManager:
+        """Get the manager for the `prometheus-slurm-exporter` service."""
+        return _PrometheusExporterManager(self._ops_manager)
+
     @property
     def user(self) -> str:
         """Get the user that managed service is running as."""
@@ -931,16 +1064,19 @@ class _SlurmManagerBase:
     @property
     def hostname(self) -> str:
         """The hostname where this manager is running."""
-        return socket.gethostname().split(".")[0]
+        return _short_hostname()
 
     @staticmethod
-    def scontrol(*args) -> str:
+    def scontrol(*args, stdin: Optional[str] = None) -> str:
         """Control Slurm via `scontrol` commands.
 
+        Multiple commands can be run in a single `scontrol` invocation by passing
+        them as newline-separated lines via `stdin` instead of `args`.
+
         Raises:
             SlurmOpsError: Raised if `scontrol` command fails.
         """
-        return _call("scontrol", *args).stdout
+        return _call("scontrol", *args, stdin=stdin).stdout
 
 
 class SackdManager(_SlurmManagerBase):
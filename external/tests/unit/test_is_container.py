@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# Copyright 2024 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the `is_container` charm library."""
+
+from unittest.mock import patch
+
+import pytest
+from charms.hpc_libs.v0.is_container import _container_from_environment, is_container
+
+
+@pytest.mark.parametrize(
+    "marker,contents",
+    [
+        ("/run/systemd/container", "lxc\n"),
+        ("/proc/1/environ", "PATH=/usr/bin\0container=lxc\0"),
+        ("/.dockerenv", ""),
+        ("/run/.containerenv", ""),
+        ("/run/host/container-manager", "podman\n"),
+    ],
+)
+def test_container_from_environment_marker_present(fs, marker, contents) -> None:
+    """Test that a container is detected from any of the runtime markers."""
+    fs.create_file(marker, contents=contents)
+    assert _container_from_environment() is True
+
+
+def test_container_from_environment_marker_absent(fs) -> None:
+    """Test that the absence of a marker defers to `systemd-detect-virt`."""
+    fs.create_file("/run/systemd/container", contents="none\n")
+    fs.create_file("/proc/1/environ", contents="PATH=/usr/bin\0")
+    assert _container_from_environment() is None
+
+
+def test_container_from_environment_marker_unreadable(fs) -> None:
+    """Test that unreadable markers defer to `systemd-detect-virt`."""
+    fs.create_file("/proc/1/environ", contents="container=lxc\0")
+    with patch("pathlib.Path.read_bytes", side_effect=PermissionError):
+        assert _container_from_environment() is None
+
+
+@patch("charms.hpc_libs.v0.is_container.shutil.which", return_value="/usr/bin/systemd-detect-virt")
+@patch("charms.hpc_libs.v0.is_container.subprocess.run")
+@patch("charms.hpc_libs.v0.is_container._container_from_environment", return_value=None)
+def test_is_container_falls_back_to_systemd_detect_virt(_, run, __) -> None:
+    """Test that `systemd-detect-virt` decides when no marker is found."""
+    run.return_value.returncode = 0
+    is_container.cache_clear()
+    try:
+        assert is_container() is True
+        run.assert_called_once()
+    finally:
+        is_container.cache_clear()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# Copyright 2024 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the `slurm_ops` charm library."""
+
+from unittest.mock import patch
+
+import dotenv
+import pytest
+from charms.hpc_libs.v0.slurm_ops import (
+    SlurmOpsError,
+    _CgroupConfigManager,
+    _EnvManager,
+    _ServiceType,
+    _SnapManager,
+    _SnapServiceManager,
+)
+from slurmutils.editors import cgroupconfig
+
+SNAP_SERVICES_HEADER = "Service          Startup  Current   Notes\n"
+SNAP_LIST_HEADER = "Name   Version  Rev  Tracking          Publisher  Notes\n"
+
+
+@pytest.fixture
+def env_file(tmp_path):
+    """Return the path to an environment file in a temporary directory."""
+    return tmp_path / "slurmdbd"
+
+
+def test_env_set_rewrites_every_occurrence(env_file) -> None:
+    """Test that every occurrence of a duplicated variable is rewritten."""
+    env_file.write_text("# comment\nA='1'\nB=2\nA='3'\n")
+    _EnvManager(env_file).set({"a": "x"})
+
+    assert env_file.read_text() == "# comment\nA='x'\nB=2\nA='x'\n"
+    assert dotenv.get_key(env_file, "A") == "x"
+
+
+def test_env_update_sets_and_unsets(env_file) -> None:
+    """Test that variables are set, appended, and unset in a single rewrite."""
+    env_file.write_text("A='1'\nB='2'")
+    _EnvManager(env_file).update({"a": "x", "c": "y"}, remove=["b"])
+
+    assert env_file.read_text() == "A='x'\nC='y'\n"
+
+
+def test_env_unset_missing_file(env_file) -> None:
+    """Test that unsetting a variable does not create a missing environment file."""
+    _EnvManager(env_file).unset("a")
+
+    assert not env_file.exists()
+
+
+def test_env_set_escapes_quotes(env_file) -> None:
+    """Test that single quotes in values are escaped."""
+    env = _EnvManager(env_file)
+    env.set({"opts": "it's"})
+
+    assert env_file.read_text() == "OPTS='it\\'s'\n"
+    assert env.get("opts") == "it's"
+
+
+def test_env_set_keeps_mode_and_owner(env_file) -> None:
+    """Test that the environment file keeps its mode and owner when replaced."""
+    env_file.write_text("A='1'\n")
+    env_file.chmod(0o640)
+    stat = env_file.stat()
+
+    with patch("charms.hpc_libs.v0.slurm_ops.os.chown") as chown:
+        _EnvManager(env_file).set({"a": "x"})
+
+    chown.assert_called_once_with(
+        env_file.with_name(f".{env_file.name}.tmp"), stat.st_uid, stat.st_gid
+    )
+    assert env_file.stat().st_mode & 0o7777 == 0o640
+    assert list(env_file.parent.iterdir()) == [env_file]
+
+
+def test_env_set_new_file_mode(env_file) -> None:
+    """Test that a new environment file is world-readable."""
+    _EnvManager(env_file).set({"a": "x"})
+
+    assert env_file.stat().st_mode & 0o7777 == 0o644
+
+
+@pytest.mark.parametrize(
+    "current,active",
+    [
+        ("enabled  active    -", True),
+        ("disabled  inactive  -", False),
+    ],
+)
+def test_snap_service_active(current, active) -> None:
+    """Test that the service state is parsed from `snap services`."""
+    with patch(
+        "charms.hpc_libs.v0.slurm_ops._snap",
+        return_value=f"{SNAP_SERVICES_HEADER}slurm.slurmctld  {current}\n",
+    ) as snap:
+        assert _SnapServiceManager(_ServiceType.SLURMCTLD).active() is active
+
+    snap.assert_called_once_with("services", "slurm.slurmctld")
+
+
+@pytest.mark.parametrize("output", ["", SNAP_SERVICES_HEADER])
+def test_snap_service_active_missing_row(output) -> None:
+    """Test that a missing `snap services` row raises `SlurmOpsError`."""
+    with patch("charms.hpc_libs.v0.slurm_ops._snap", return_value=output):
+        with pytest.raises(SlurmOpsError):
+            _SnapServiceManager(_ServiceType.SLURMCTLD).active()
+
+
+def test_snap_version() -> None:
+    """Test that the snap version is parsed from `snap list`."""
+    with patch(
+        "charms.hpc_libs.v0.slurm_ops._snap",
+        return_value=f"{SNAP_LIST_HEADER}slurm  23.11.7  x1   latest/candidate  canonical  classic\n",
+    ) as snap:
+        assert _SnapManager().version() == "23.11.7"
+
+    snap.assert_called_once_with("list", "slurm")
+
+
+@pytest.mark.parametrize("output", ["", SNAP_LIST_HEADER])
+def test_snap_version_missing_row(output) -> None:
+    """Test that a missing `snap list` row raises `SlurmOpsError`."""
+    with patch("charms.hpc_libs.v0.slurm_ops._snap", return_value=output):
+        with pytest.raises(SlurmOpsError):
+            _SnapManager().version()
+
+
+def test_config_edit_unchanged_does_not_dump(tmp_path) -> None:
+    """Test that an edit which changes nothing does not rewrite the configuration file."""
+    config_path = tmp_path / "cgroup.conf"
+    config_path.write_text("ConstrainCores=yes\n")
+
+    with patch.object(cgroupconfig, "dump") as dump:
+        with _CgroupConfigManager(config_path, "root", "root").edit() as config:
+            config.constrain_cores = "yes"
+
+    dump.assert_not_called()
+
+
+def test_config_edit_changed_dumps(tmp_path) -> None:
+    """Test that an edit which changes the configuration rewrites the configuration file."""
+    config_path = tmp_path / "cgroup.conf"
+    config_path.write_text("ConstrainCores=yes\n")
+
+    with patch.object(cgroupconfig, "dump") as dump:
+        with _CgroupConfigManager(config_path, "root", "root").edit() as config:
+            config.constrain_cores = "no"
+
+    dump.assert_called_once()
+    assert dump.call_args.args[0].constrain_cores == "no"
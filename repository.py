@@ -5,20 +5,33 @@
 """CLI tool to execute an action on any charm managed by this repository."""
 
 import argparse
-import glob
 import logging
 import os
 import pathlib
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 ROOT_DIR = pathlib.Path(__file__).parent
-EXTERNAL_LIB_DIR = ROOT_DIR / "external" / "lib"
+EXTERNAL_DIR = ROOT_DIR / "external"
+EXTERNAL_LIB_DIR = EXTERNAL_DIR / "lib"
 BUILD_PATH = ROOT_DIR / "_build"
 BUILD_FILE = "build.yaml"
+# External libraries that carry local changes which have not landed in charmed-hpc/hpc-libs
+# yet. Fetching them from Charmhub would discard those changes, so `fetch-lib` skips them
+# unless `--force` is passed. Their LIBPATCH is left at the upstream release they are based on.
+PATCHED_EXTERNAL_LIBRARIES = {
+    "charms.hpc_libs.v0.is_container",
+    "charms.hpc_libs.v0.slurm_ops",
+}
 
 
 logger = logging.getLogger(__name__)
@@ -40,7 +53,7 @@ class SlurmCharm:
     def load(cls, path: pathlib.Path) -> "SlurmCharm":
         """Load this charm from a path to its `build.yaml` file."""
         with path.open() as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
             return cls(
                 path=path.parent,
                 external_libraries=data.get("external-libraries", []),
@@ -132,13 +145,43 @@ def load_charm(charm: str) -> SlurmCharm:
     return SlurmCharm.load(path)
 
 
-def copy(src: pathlib.Path, dest: pathlib.Path):
-    """Copy the src to dest.
+def link(src, dest):
+    """Hardlink the src to dest, falling back to a copy if linking is not possible.
 
-    Only supports files.
+    Only supports files. Accepts the same arguments as `shutil.copytree`'s `copy_function`.
+    """
+    src, dest = pathlib.Path(src), pathlib.Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists():
+        if dest.samefile(src):
+            return dest
+        dest.unlink()
+    try:
+        os.link(src, dest)
+    except OSError:
+        # EXDEV or EPERM if the build directory is on another filesystem or links are not allowed.
+        shutil.copy2(src, dest)
+    return dest
+
+
+def _stage_file(name: str, src: pathlib.Path, dest: pathlib.Path, dry_run: bool = False):
+    """Hardlink src to dest unless dest already exists.
+
+    Lets `os.link` report an existing dest instead of checking for it first.
     """
+    if dry_run:
+        if not dest.exists():
+            logger.debug(f"Linking {name} to {dest}")
+        return
+
     dest.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy(src, dest)
+    try:
+        os.link(src, dest)
+    except FileExistsError:
+        return
+    except OSError:
+        shutil.copy2(src, dest)
+    logger.debug(f"Linked {name} to {dest}")
 
 
 def stage_charm(
@@ -154,33 +197,21 @@ def stage_charm(
     """
     logger.info(f"Staging charm {charm.path.name}.")
     if not dry_run:
-        shutil.copytree(charm.path, charm.build_path, dirs_exist_ok=True)
+        shutil.copytree(charm.path, charm.build_path, copy_function=link, dirs_exist_ok=True)
     for library in charm.external_libraries:
         path = external_libraries[library]
         library_path = path.relative_to(EXTERNAL_LIB_DIR)
         dest = charm.build_path / "lib" / library_path
-        if not dest.exists():
-            logger.debug(f"Copying {library} to {dest}")
-            if dry_run:
-                continue
-            copy(path, dest)
+        _stage_file(library, path, dest, dry_run=dry_run)
     for library in charm.internal_libraries:
         path = internal_libraries[library]
         library_path = _library_to_path(library)
         dest = charm.build_path / "lib" / library_path
-        if not dest.exists():
-            logger.debug(f"Copying {library} to {dest}")
-            if dry_run:
-                continue
-            copy(path, dest)
+        _stage_file(library, path, dest, dry_run=dry_run)
     for template in charm.templates:
         path = templates[template]
         dest = charm.build_path / "src" / "templates" / template
-        if not dest.exists():
-            logger.debug(f"Copying {template} to {dest}")
-            if dry_run:
-                continue
-            copy(path, dest)
+        _stage_file(template, path, dest, dry_run=dry_run)
     logger.info(f"Charm {charm.path.name} staged at {charm.build_path}.")
 
 
@@ -256,6 +287,12 @@ def main_cli():
 
     fetch_lib_parser = subparsers.add_parser("fetch-lib", help="Fetch the external libraries.")
     fetch_lib_parser.add_argument("libraries", type=str, nargs="*", help="Libraries to fetch.")
+    fetch_lib_parser.add_argument(
+        "--force",
+        action="store_true",
+        default=False,
+        help="Also fetch the libraries that carry local changes.",
+    )
     fetch_lib_parser.set_defaults(func=fetch_lib_cli)
 
     fmt_parser = subparsers.add_parser("fmt", help="Apply formatting standards to code.")
@@ -401,17 +438,43 @@ def pythonpath_cli(internal_libraries: dict[str, pathlib.Path], **kwargs):
     print(":".join(str(p) for p in parent_dirs))
 
 
-def fetch_lib_cli(libraries: list[str], external_libraries: dict[str, pathlib.Path], **kwargs):
+def fetch_lib_cli(
+    libraries: list[str],
+    external_libraries: dict[str, pathlib.Path],
+    force: bool = False,
+    **kwargs,
+):
     """Fetch the external libraries."""
     cwd = EXTERNAL_LIB_DIR.parent
     libraries_set = set(libraries)
+    if not force:
+        patched = PATCHED_EXTERNAL_LIBRARIES & (libraries_set or external_libraries.keys())
+        if patched:
+            logging.warning(
+                f"Skipping {', '.join(sorted(patched))}: they carry local changes that would"
+                + " be lost. Pass --force to fetch them anyway."
+            )
+            # Name the remaining libraries explicitly so that a bare `fetch-lib` doesn't
+            # update the patched ones as well.
+            libraries_set = (libraries_set or set(external_libraries)) - patched
+            if not libraries_set:
+                return
+
     if not libraries_set:
-        libraries_set = set(external_libraries.keys())
-    for library in libraries_set:
+        # Without arguments, `charmcraft fetch-lib` updates every library under `lib/`
+        # in a single run.
+        logging.info(f"Fetching {', '.join(sorted(external_libraries))}")
+        subprocess.run(["charmcraft", "fetch-lib"], cwd=cwd, check=True)
+        return
+
+    def fetch(library: str):
         logging.info(f"Fetching {library}")
-        # Fetch the library
         subprocess.run(["charmcraft", "fetch-lib", library], cwd=cwd, check=True)
 
+    with ThreadPoolExecutor(max_workers=len(libraries_set)) as executor:
+        # Consume the results so that a failed fetch is raised here.
+        list(executor.map(fetch, libraries_set))
+
 
 def fmt_cli(
     slurm_charms: [str],
@@ -420,6 +483,7 @@ def fmt_cli(
     """Apply formatting standards to code. """
     files = get_source_dirs(slurm_charms)
     files.append(str(ROOT_DIR / "tests"))
+    files.append(str(EXTERNAL_DIR / "tests"))
     logging.info(f"Running black for directories {files}")
     subprocess.run(["black", "--config", "pyproject.toml"] + files, cwd=ROOT_DIR, check=True)
     subprocess.run(["ruff", "check", "--fix"] + files, cwd=ROOT_DIR, check=True)
@@ -433,21 +497,28 @@ def lint_cli(
     """Check code against coding style standards."""
     files = get_source_dirs(slurm_charms)
     files.append(str(ROOT_DIR / "tests"))
+    files.append(str(EXTERNAL_DIR / "tests"))
     logging.info("Target directories: {files}")
+    commands = {
+        "black": ["black", "--config", "pyproject.toml"] + ([] if fix else ["--check"]) + files,
+        "codespell": ["codespell"] + (["-w"] if fix else []) + files,
+        "ruff": ["ruff", "check"] + (["--fix"] if fix else []) + files,
+    }
     if fix:
+        # The fixers rewrite the same files, so they must not run at the same time.
         logging.info("Trying to automatically fix the lint errors.")
-    logging.info("Running black...")
-    subprocess.run(
-        ["black", "--config", "pyproject.toml"] + ([] if fix else ["--check"]) + files,
-        cwd=ROOT_DIR,
-        check=True,
-    )
-    logging.info("Running codespell...")
-    subprocess.run(["codespell"] + (["-w"] if fix else []) + files, cwd=ROOT_DIR, check=True)
-    logging.info("Running ruff...")
-    subprocess.run(
-        ["ruff", "check"] + (["--fix"] if fix else []) + files, cwd=ROOT_DIR, check=True
-    )
+        for name, cmd in commands.items():
+            logging.info(f"Running {name}...")
+            subprocess.run(cmd, cwd=ROOT_DIR, check=True)
+        return
+
+    logging.info(f"Running {', '.join(commands)}...")
+    processes = [subprocess.Popen(cmd, cwd=ROOT_DIR) for cmd in commands.values()]
+    for process in processes:
+        process.wait()
+    for process in processes:
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
 
 
 def type_cli(
@@ -484,7 +555,8 @@ def unit_test_cli(
     **kwargs,
 ):
     """Run unit tests."""
-    subprocess.run(["coverage", "erase"], check=True)
+    # `coverage` is only installed in the unit test environment.
+    import coverage
 
     files = []
 
@@ -509,13 +581,59 @@ def unit_test_cli(
         if cov_path.is_file():
             files.append(str(cov_path))
 
+    logger.info("Running unit tests for the external libraries")
+    subprocess.run(["coverage", "erase"], cwd=EXTERNAL_DIR, check=True)
+    subprocess.run(
+        "coverage run --source ./lib -m pytest -v --tb native -s ./tests/unit".split(),
+        cwd=EXTERNAL_DIR,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(EXTERNAL_LIB_DIR)},
+    )
+    cov_path = EXTERNAL_DIR / ".coverage"
+    if cov_path.is_file():
+        files.append(str(cov_path))
+
     logger.info("Generating global results...")
-    subprocess.run(["coverage", "combine"] + files, check=True)
-    subprocess.run(["coverage", "report"], check=True)
-    subprocess.run(["coverage", "xml", "-o", "cover/coverage.xml"])
+    # Combine and report in-process instead of starting a `coverage` interpreter per step.
+    cov = coverage.Coverage()
+    cov.erase()
+    cov.combine(files)
+    cov.save()
+    cov.report()
+    cov.xml_report(outfile="cover/coverage.xml")
     logger.info(f"XML report generated at {ROOT_DIR}/cover/coverage.xml")
 
 
+def _build_charm(
+    charm: SlurmCharm,
+    internal_libraries: dict[str, pathlib.Path],
+    external_libraries: dict[str, pathlib.Path],
+    templates: dict[str, pathlib.Path],
+):
+    """Stage and pack a single slurm charm."""
+    logger.info("Staging the charm %s", charm.path.name)
+    stage_charm(
+        charm,
+        internal_libraries,
+        external_libraries,
+        templates,
+        dry_run=False,
+    )
+    logger.info("Building the charm %s", charm.path.name)
+    subprocess.run(
+        "charmcraft -v pack".split(),
+        cwd=charm.build_path,
+        check=True,
+    )
+
+    charm_long_path = next(charm.build_path.glob(f"{charm.path.name}_*.charm"))
+    logger.info("Moving charm %s to %s", charm_long_path, charm.charm_path)
+
+    # Both paths are under the build directory, so this is a rename rather than a copy.
+    charm_long_path.replace(charm.charm_path)
+    logger.info("Built charm %s", charm.charm_path)
+
+
 def build_cli(
     charms: [SlurmCharm],
     internal_libraries: dict[str, pathlib.Path],
@@ -524,32 +642,16 @@ def build_cli(
     **kwargs,
 ):
     """Build all the specified slurm charms."""
-    for charm in charms:
-        logger.info("Staging the charm %s", charm.path.name)
-        stage_charm(
-            charm,
-            internal_libraries,
-            external_libraries,
-            templates,
-            dry_run=False,
-        )
-        logger.info("Building the charm %s", charm.path.name)
-        subprocess.run(
-            "charmcraft -v pack".split(),
-            cwd=charm.build_path,
-            check=True,
-        )
-
-        charm_long_path = (
-            charm.build_path
-            / glob.glob(f"{charm.path.name}_*.charm", root_dir=charm.build_path)[0]
-        )
-        logger.info("Moving charm %s to %s", charm_long_path, charm.charm_path)
-
-        charm.charm_path.unlink(missing_ok=True)
-        copy(charm_long_path, charm.charm_path)
-        charm_long_path.unlink()
-        logger.info("Built charm %s", charm.charm_path)
+    # Each charm is packed in its own build directory, so the packs can run side by side.
+    with ThreadPoolExecutor(max_workers=max(len(charms), 1)) as executor:
+        builds = [
+            executor.submit(
+                _build_charm, charm, internal_libraries, external_libraries, templates
+            )
+            for charm in charms
+        ]
+        for build in builds:
+            build.result()
 
 
 def integration_tests_cli(
@@ -15,10 +15,13 @@
 
 """Configure slurmctld operator integration tests."""
 
+import asyncio
+import hashlib
 import logging
 import os
+import shutil
 from pathlib import Path
-from typing import Union
+from typing import NamedTuple, Optional
 
 import pytest
 from pytest_operator.plugin import OpsTest
@@ -29,6 +32,44 @@ SLURMD_DIR = Path(slurmd) if (slurmd := os.getenv("SLURMD_DIR")) else None
 SLURMDBD_DIR = Path(slurmdbd) if (slurmdbd := os.getenv("SLURMDBD_DIR")) else None
 SLURMRESTD_DIR = Path(slurmrestd) if (slurmrestd := os.getenv("SLURMRESTD_DIR")) else None
 SACKD_DIR = Path(sackd) if (sackd := os.getenv("SACKD_DIR")) else None
+CHARM_DIRS = {
+    "slurmctld": SLURMCTLD_DIR,
+    "slurmd": SLURMD_DIR,
+    "slurmdbd": SLURMDBD_DIR,
+    "slurmrestd": SLURMRESTD_DIR,
+    "sackd": SACKD_DIR,
+}
+PACK_CACHE_DIR = Path("~/.cache/slurm-charms").expanduser()
+
+
+class DeployArgs(NamedTuple):
+    """Where to deploy a Slurm charm from."""
+
+    source: str
+    channel: Optional[str] = None
+
+
+def _source_digest(path: Path) -> str:
+    """Hash the file names and contents of a charm source tree."""
+    digest = hashlib.sha256()
+    for file in sorted(path.rglob("*")):
+        if file.is_file() and "__pycache__" not in file.parts:
+            digest.update(str(file.relative_to(path)).encode() + b"\0")
+            digest.update(hashlib.sha256(file.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+async def _pack(ops_test: OpsTest, name: str, path: Path) -> Path:
+    """Pack a charm, reusing an earlier pack of the same sources if one is cached."""
+    cached = PACK_CACHE_DIR / f"{name}-{_source_digest(path)}.charm"
+    if cached.exists():
+        logger.info(f"Using cached {name} charm {cached}")
+        return cached
+
+    charm = await ops_test.build_charm(path, verbosity="verbose")
+    PACK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    shutil.copy(charm, cached)
+    return charm
 
 
 def pytest_addoption(parser) -> None:
@@ -40,92 +81,62 @@ def pytest_addoption(parser) -> None:
     )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def charm_base(request) -> str:
     """Get slurmctld charm base to use."""
     return request.config.option.charm_base
 
 
 @pytest.fixture(scope="module")
-async def slurmctld_charm(request, ops_test: OpsTest) -> Union[str, Path]:
-    """Pack slurmctld charm to use for integration tests.
+async def slurm_charms(ops_test: OpsTest) -> dict[str, DeployArgs]:
+    """Pack the Slurm charms to use for integration tests.
 
-    If the `SLURMCTLD_DIR` environment variable is not set, this will pull the charm from
-    Charmhub instead.
+    The locally built charms are packed concurrently, and packs are cached in `PACK_CACHE_DIR`
+    by the hash of their sources. Charms whose `<NAME>_DIR` environment variable is not set
+    are pulled from Charmhub instead.
 
     Returns:
-        `Path` if "slurmctld" is built locally. `str` otherwise.
+        Mapping of charm name to the packed charm file if the charm is built locally,
+        or to the charm's `edge` channel on Charmhub otherwise.
     """
-    if not SLURMCTLD_DIR:
-        logger.info("Pulling slurmctld from Charmhub")
-        return "slurmctld"
+    local = {}
+    for name, path in CHARM_DIRS.items():
+        if path:
+            local[name] = path
+        else:
+            logger.info(f"Pulling {name} from Charmhub")
 
-    return await ops_test.build_charm(SLURMCTLD_DIR, verbosity="verbose")
+    packed = await asyncio.gather(*(_pack(ops_test, name, path) for name, path in local.items()))
+    return {name: DeployArgs(name, channel="edge") for name in CHARM_DIRS} | {
+        name: DeployArgs(str(charm)) for name, charm in zip(local, packed)
+    }
 
 
 @pytest.fixture(scope="module")
-async def slurmd_charm(request, ops_test: OpsTest) -> Union[str, Path]:
-    """Pack slurmd charm to use for integration tests.
-
-    If the `SLURMD_DIR` environment variable is not set, this will pull the charm from
-    Charmhub instead.
-
-    Returns:
-        `Path` if "slurmd" is built locally. `str` otherwise.
-    """
-    if not SLURMD_DIR:
-        logger.info("Pulling slurmd from Charmhub")
-        return "slurmd"
-
-    return await ops_test.build_charm(SLURMD_DIR, verbosity="verbose")
+def slurmctld_charm(slurm_charms) -> DeployArgs:
+    """Get the slurmctld charm to use for integration tests."""
+    return slurm_charms["slurmctld"]
 
 
 @pytest.fixture(scope="module")
-async def slurmdbd_charm(request, ops_test: OpsTest) -> Union[str, Path]:
-    """Pack slurmdbd charm to use for integration tests.
-
-    If the `SLURMDBD_DIR` environment variable is not set, this will pull the charm from
-    Charmhub instead.
-
-    Returns:
-        `Path` if "slurmdbd" is built locally. `str` otherwise..
-    """
-    if not SLURMDBD_DIR:
-        logger.info("Pulling slurmdbd from Charmhub")
-        return "slurmdbd"
-
-    return await ops_test.build_charm(SLURMDBD_DIR, verbosity="verbose")
+def slurmd_charm(slurm_charms) -> DeployArgs:
+    """Get the slurmd charm to use for integration tests."""
+    return slurm_charms["slurmd"]
 
 
 @pytest.fixture(scope="module")
-async def slurmrestd_charm(request, ops_test: OpsTest) -> Union[str, Path]:
-    """Pack slurmrestd charm to use for integration tests.
-
-    If the `SLURMRESTD_DIR` environment variable is not set, this will pull the charm from
-    Charmhub instead.
-
-    Returns:
-        `Path` if "slurmrestd" is built locally. `str` otherwise..
-    """
-    if not SLURMRESTD_DIR:
-        logger.info("Pulling slurmrestd from Charmhub")
-        return "slurmrestd"
-
-    return await ops_test.build_charm(SLURMRESTD_DIR, verbosity="verbose")
+def slurmdbd_charm(slurm_charms) -> DeployArgs:
+    """Get the slurmdbd charm to use for integration tests."""
+    return slurm_charms["slurmdbd"]
 
 
 @pytest.fixture(scope="module")
-async def sackd_charm(request, ops_test: OpsTest) -> Union[str, Path]:
-    """Pack sackd_charm charm to use for integration tests.
+def slurmrestd_charm(slurm_charms) -> DeployArgs:
+    """Get the slurmrestd charm to use for integration tests."""
+    return slurm_charms["slurmrestd"]
 
-    If the `SACKD_DIR` environment variable is not set, this will pull the charm from
-    Charmhub instead.
 
-    Returns:
-        `Path` if "sackd" is built locally. `str` otherwise..
-    """
-    if not SACKD_DIR:
-        logger.info("Pulling sackd from Charmhub")
-        return "sackd"
-
-    return await ops_test.build_charm(SACKD_DIR, verbosity="verbose")
+@pytest.fixture(scope="module")
+def sackd_charm(slurm_charms) -> DeployArgs:
+    """Get the sackd charm to use for integration tests."""
+    return slurm_charms["sackd"]
@@ -19,7 +19,7 @@ import asyncio
 import logging
 
 import pytest
-import tenacity
+from juju.unit import Unit
 from pytest_operator.plugin import OpsTest
 
 logger = logging.getLogger(__name__)
@@ -34,6 +34,18 @@ ROUTER = "mysql-router"
 SLURM_APPS = [SLURMCTLD, SLURMD, SLURMDBD, SLURMRESTD, SACKD]
 
 
+@pytest.fixture(scope="module")
+async def settled(ops_test: OpsTest) -> None:
+    """Wait for the SLURM applications to settle before probing their units."""
+    await ops_test.model.wait_for_idle(apps=SLURM_APPS, status="active", timeout=60, idle_period=5)
+
+
+@pytest.fixture(scope="module")
+def units(ops_test: OpsTest, settled) -> dict[str, Unit]:
+    """Get the unit of each settled SLURM application."""
+    return {app: ops_test.model.applications[app].units[0] for app in SLURM_APPS}
+
+
 @pytest.mark.abort_on_fail
 @pytest.mark.skip_if_deployed
 @pytest.mark.order(1)
@@ -48,45 +60,20 @@ async def test_build_and_deploy_against_edge(
 ) -> None:
     """Test that the slurmctld charm can stabilize against slurmd, slurmdbd, slurmrestd, sackd, and MySQL."""
     logger.info(f"Deploying {', '.join(SLURM_APPS)}, and {DATABASE}")
-    # Pack charms and download NHC resource for the slurmd operator.
-    slurmctld, slurmd, slurmdbd, slurmrestd, sackd = await asyncio.gather(
-        slurmctld_charm, slurmd_charm, slurmdbd_charm, slurmrestd_charm, sackd_charm
-    )
     # Deploy the test Charmed SLURM cloud.
     await asyncio.gather(
-        ops_test.model.deploy(
-            str(slurmctld),
-            application_name=SLURMCTLD,
-            num_units=1,
-            base=charm_base,
-        ),
-        ops_test.model.deploy(
-            str(slurmd),
-            application_name=SLURMD,
-            channel="edge" if isinstance(slurmd, str) else None,
-            num_units=1,
-            base=charm_base,
-        ),
-        ops_test.model.deploy(
-            str(slurmdbd),
-            application_name=SLURMDBD,
-            channel="edge" if isinstance(slurmdbd, str) else None,
-            num_units=1,
-            base=charm_base,
-        ),
-        ops_test.model.deploy(
-            str(slurmrestd),
-            application_name=SLURMRESTD,
-            channel="edge" if isinstance(slurmrestd, str) else None,
-            num_units=1,
-            base=charm_base,
-        ),
-        ops_test.model.deploy(
-            str(sackd),
-            application_name=SACKD,
-            channel="edge" if isinstance(sackd, str) else None,
-            num_units=1,
-            base=charm_base,
+        *(
+            ops_test.model.deploy(
+                charm.source,
+                application_name=app,
+                channel=charm.channel,
+                num_units=1,
+                base=charm_base,
+            )
+            for app, charm in zip(
+                SLURM_APPS,
+                (slurmctld_charm, slurmd_charm, slurmdbd_charm, slurmrestd_charm, sackd_charm),
+            )
         ),
         # TODO:
         #   Re-enable `mysql-router` in the integration tests once `dpe/edge`
@@ -106,13 +93,15 @@ async def test_build_and_deploy_against_edge(
             base="ubuntu@22.04",
         ),
     )
-    # Set integrations for charmed applications.
-    await ops_test.model.integrate(f"{SLURMCTLD}:{SLURMD}", f"{SLURMD}:{SLURMCTLD}")
-    await ops_test.model.integrate(f"{SLURMCTLD}:{SLURMDBD}", f"{SLURMDBD}:{SLURMCTLD}")
-    await ops_test.model.integrate(f"{SLURMCTLD}:{SLURMRESTD}", f"{SLURMRESTD}:{SLURMCTLD}")
-    await ops_test.model.integrate(f"{SLURMCTLD}:login-node", f"{SACKD}:{SLURMCTLD}")
-    # await ops_test.model.integrate(f"{SLURMDBD}-{ROUTER}:backend-database", f"{DATABASE}:database")
-    await ops_test.model.integrate(f"{SLURMDBD}:database", f"{DATABASE}:database")
+    # Set integrations for charmed applications. The relations are independent of each other.
+    await asyncio.gather(
+        ops_test.model.integrate(f"{SLURMCTLD}:{SLURMD}", f"{SLURMD}:{SLURMCTLD}"),
+        ops_test.model.integrate(f"{SLURMCTLD}:{SLURMDBD}", f"{SLURMDBD}:{SLURMCTLD}"),
+        ops_test.model.integrate(f"{SLURMCTLD}:{SLURMRESTD}", f"{SLURMRESTD}:{SLURMCTLD}"),
+        ops_test.model.integrate(f"{SLURMCTLD}:login-node", f"{SACKD}:{SLURMCTLD}"),
+        # ops_test.model.integrate(f"{SLURMDBD}-{ROUTER}:backend-database", f"{DATABASE}:database"),
+        ops_test.model.integrate(f"{SLURMDBD}:database", f"{DATABASE}:database"),
+    )
     # Reduce the update status frequency to accelerate the triggering of deferred events.
     async with ops_test.fast_forward():
         await ops_test.model.wait_for_idle(apps=SLURM_APPS, status="active", timeout=1000)
@@ -122,61 +111,32 @@ async def test_build_and_deploy_against_edge(
 
 @pytest.mark.abort_on_fail
 @pytest.mark.order(2)
-@tenacity.retry(
-    wait=tenacity.wait.wait_exponential(multiplier=2, min=1, max=30),
-    stop=tenacity.stop_after_attempt(3),
-    reraise=True,
-)
-async def test_munge_is_active(ops_test: OpsTest) -> None:
-    """Test that munge is active inside all the SLURM units."""
-    for app in SLURM_APPS:
-        logger.info(f"Checking that munge is active inside {app}.")
-        unit = ops_test.model.applications[app].units[0]
-        res = (await unit.ssh("systemctl is-active munge")).strip("\n")
-        assert res == "active"
+async def test_services_are_active(units: dict[str, Unit]) -> None:
+    """Test that munge and the SLURM services are active inside the SLURM units."""
+    logger.info(f"Checking that munge and the {', '.join(SLURM_APPS)} services are active.")
+    # Check both services with a single SSH session per unit.
+    results = await asyncio.gather(
+        *(units[app].ssh(f"systemctl is-active munge {app}") for app in SLURM_APPS)
+    )
+    for app, res in zip(SLURM_APPS, results):
+        munge, service = res.strip("\n").splitlines()
+        assert munge == "active", f"munge is not active inside {app}"
+        assert service == "active", f"the {app} service is not active"
 
 
 @pytest.mark.abort_on_fail
 @pytest.mark.order(3)
-@tenacity.retry(
-    wait=tenacity.wait.wait_exponential(multiplier=2, min=1, max=30),
-    stop=tenacity.stop_after_attempt(3),
-    reraise=True,
-)
-async def test_services_are_active(ops_test: OpsTest) -> None:
-    """Test that the SLURM services are active inside the SLURM units."""
-    for app in SLURM_APPS:
-        logger.info(f"Checking that the {app} service is active inside the {app} unit.")
-        unit = ops_test.model.applications[app].units[0]
-        res = (await unit.ssh(f"systemctl is-active {app}")).strip("\n")
-        assert res == "active"
-
-
-@pytest.mark.abort_on_fail
-@pytest.mark.order(4)
-@tenacity.retry(
-    wait=tenacity.wait.wait_exponential(multiplier=2, min=1, max=30),
-    stop=tenacity.stop_after_attempt(3),
-    reraise=True,
-)
-async def test_slurmctld_port_listen(ops_test: OpsTest) -> None:
+async def test_slurmctld_port_listen(units: dict[str, Unit]) -> None:
     """Test that slurmctld is listening on port 6817."""
     logger.info("Checking that slurmctld is listening on port 6817")
-    slurmctld_unit = ops_test.model.applications[SLURMCTLD].units[0]
-    res = await slurmctld_unit.ssh("sudo lsof -t -n -iTCP:6817 -sTCP:LISTEN")
-    assert res != ""
+    res = await units[SLURMCTLD].ssh("ss -Hltn 'sport = :6817'")
+    assert res.strip()
 
 
 @pytest.mark.abort_on_fail
-@pytest.mark.order(5)
-@tenacity.retry(
-    wait=tenacity.wait.wait_exponential(multiplier=2, min=1, max=30),
-    stop=tenacity.stop_after_attempt(3),
-    reraise=True,
-)
-async def test_slurmdbd_port_listen(ops_test: OpsTest) -> None:
+@pytest.mark.order(4)
+async def test_slurmdbd_port_listen(units: dict[str, Unit]) -> None:
     """Test that slurmdbd is listening on port 6819."""
     logger.info("Checking that slurmdbd is listening on port 6819")
-    slurmdbd_unit = ops_test.model.applications[SLURMDBD].units[0]
-    res = await slurmdbd_unit.ssh("sudo lsof -t -n -iTCP:6819 -sTCP:LISTEN")
-    assert res != ""
+    res = await units[SLURMDBD].ssh("ss -Hltn 'sport = :6819'")
+    assert res.strip()